@@ -9,8 +9,9 @@ from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, __version__ as HA_
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, MIN_HA_VERSION, PLATFORMS, VERSION
+from .const import DOMAIN, MIN_HA_VERSION, PLATFORMS, STORAGE_VERSION, VERSION
 from .controller import Controller
 from .services import async_setup_services
 
@@ -63,6 +64,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and import progress with the config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.statistics"
+    ).async_remove()
+
+
 async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Update listener."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -5,10 +5,9 @@ import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MANUFACTURER, MODEL_EQUALIZER
+from .const import DOMAIN
 from .entity import ChargerEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,7 +20,7 @@ async def async_setup_entry(
     controller = hass.data[DOMAIN]["controller"]
     entities = controller.get_binary_sensor_entities()
     async_add_entities(entities)
-    await controller.async_setup_done("binary_sensor")
+    await controller.async_setup_done("binary_sensor", async_add_entities)
 
 
 class ChargerBinarySensor(ChargerEntity, BinarySensorEntity):
@@ -42,15 +41,3 @@ class EqualizerBinarySensor(ChargerEntity, BinarySensorEntity):
         """Return true if the binary sensor is on."""
         _LOGGER.debug("Getting state of %s", self._entity_name)
         return self._state
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device information."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.data.product.id)},
-            serial_number=self.data.product.id,
-            name=self.data.product.name,
-            manufacturer=MANUFACTURER,
-            model=MODEL_EQUALIZER,
-            configuration_url=f"https://easee.cloud/mypage/products/{self.data.product.id}",
-        )
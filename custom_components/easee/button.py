@@ -22,7 +22,7 @@ async def async_setup_entry(
     controller = hass.data[DOMAIN]["controller"]
     entities = controller.get_button_entities()
     async_add_entities(entities)
-    await controller.async_setup_done("button")
+    await controller.async_setup_done("button", async_add_entities)
 
 
 class ChargerButton(ChargerEntity, ButtonEntity):
@@ -19,6 +19,7 @@ TIMEOUT = 30
 VERSION = "0.9.74"
 MIN_HA_VERSION = "2025.7.0"
 CONF_MONITORED_SITES = "monitored_sites"
+STORAGE_VERSION = 1
 MANUFACTURER = "Easee"
 MODEL_EQUALIZER = "Equalizer"
 MODEL_CHARGING_ROBOT = "Charging Robot"
@@ -613,6 +614,7 @@ OPTIONAL_EASEE_ENTITIES = {
         "device_class": SensorDeviceClass.VOLTAGE,
         "translation_key": "voltage",
         "state_class": SensorStateClass.MEASUREMENT,
+        "deadband": 0.5,
         "enabled_default": False,
         "entity_category": EntityCategory.DIAGNOSTIC,
     },
@@ -884,6 +886,7 @@ EASEE_EQ_ENTITIES = {
                 state["voltageL2L3"] or 0.0,
             )
         ),
+        "deadband": 0.5,
         "enabled_default": False,
         "entity_category": EntityCategory.DIAGNOSTIC,
     },
@@ -1014,6 +1017,11 @@ EASEE_STATUS = {
     161: "error_pen_fault",
 }
 
+# Charger op modes where a charging session is in progress
+CHARGING_OP_MODES = {3, 100, 101, 103, 108}
+# Charger op modes where nothing is expected to happen
+IDLE_OP_MODES = {0, 1, 102}
+
 NT_MASTER = "master"
 NT_EXTENDER = "extender"
 
@@ -1,11 +1,16 @@
 """Easee Connector class."""
 
 import asyncio
-from datetime import timedelta
+from collections import deque
+from contextlib import suppress
+from datetime import date, datetime, timedelta
+from functools import partial
 from gc import collect
 import json
 import logging
 from random import random
+import re
+import time
 
 from pyeasee import (
     Charger,
@@ -28,24 +33,29 @@ from pyeasee.exceptions import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers import aiohttp_client, entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.event import (
     async_call_later,
     async_track_time_change,
     async_track_time_interval,
 )
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 from homeassistant.util.ssl import get_default_context
 
 from .binary_sensor import ChargerBinarySensor, EqualizerBinarySensor
 from .button import ChargerButton
 from .const import (
+    CHARGING_OP_MODES,
     CONF_MONITORED_SITES,
     DOMAIN,
     EASEE_EQ_ENTITIES,
+    IDLE_OP_MODES,
     MANDATORY_EASEE_ENTITIES,
     OPTIONAL_EASEE_ENTITIES,
     PLATFORMS,
+    STORAGE_VERSION,
     TIMEOUT,
     VERSION,
     chargerObservations,
@@ -54,9 +64,14 @@ from .const import (
     weeklyScheduleStartDays,
     weeklyScheduleStopDays,
 )
-from .entity import convert_units_funcs
+from .entity import (
+    charger_device_info,
+    equalizer_device_info,
+    get_entity_descriptions,
+)
 from .light import ChargerLight
 from .sensor import ChargerSensor, EqualizerSensor
+from .statistics_importer import StatisticsImporter
 from .switch import ChargerSwitch, EqualizerSwitch
 
 ENTITY_TYPES = {
@@ -69,36 +84,503 @@ ENTITY_TYPES = {
     "eq_binary_sensor": EqualizerBinarySensor,
     "eq_switch": EqualizerSwitch,
 }
+
+# Home Assistant platform of each entity type
+ENTITY_PLATFORMS = {
+    "sensor": "sensor",
+    "binary_sensor": "binary_sensor",
+    "button": "button",
+    "light": "light",
+    "switch": "switch",
+    "eq_sensor": "sensor",
+    "eq_binary_sensor": "binary_sensor",
+    "eq_switch": "switch",
+}
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL_STATE_SECONDS = 60
 SCAN_INTERVAL_EQUALIZERS_SECONDS = 20
 SCAN_INTERVAL_SCHEDULES_SECONDS = 600
+SCAN_INTERVAL_CHARGING_SECONDS = 30
+SCAN_INTERVAL_IDLE_SECONDS = 300
+SCAN_INTERVAL_STREAM_SECONDS = 3600
+SCAN_TICK_SECONDS = 10
+SNAPSHOT_SAVE_INTERVAL_SECONDS = 600
+
+# State values that are only valid for the current session. latestPulse is
+# kept, so a restored online state still times out if no pulse follows
+TRANSIENT_STATE = {"signalRConnected"}
 
 MINIMUM_UPDATE = 0.05
 
+MAX_CONCURRENT_POLLS = 4
+MAX_CONCURRENT_SUBSCRIPTIONS = 8
+RATE_LIMIT_BACKOFF_SECONDS = 60
+
+# Cloud calls allowed per period in seconds for each class of endpoint. The
+# general quota is shared by all calls and kept below the Easee limit of 500
+# calls per 5 minutes, cost quota is per site.
+API_QUOTAS = {
+    "general": (400, 300),
+    "command": (30, 60),
+    "state": (300, 300),
+    "cost": (10, 3600),
+    "firmware": (300, 3600),
+    "history": (60, 3600),
+}
+API_PRIORITY_COMMAND = 0
+API_PRIORITY_STATE = 1
+API_PRIORITY_BACKGROUND = 2
+# Part of the general quota that a priority class must leave unused, so
+# that user commands still get through when polling and cost use it up
+API_PRIORITY_RESERVE = {
+    API_PRIORITY_COMMAND: 0.0,
+    API_PRIORITY_STATE: 0.1,
+    API_PRIORITY_BACKGROUND: 0.3,
+}
+# Quotas are halved on each 429 down to this part of the configured quota,
+# and doubled again after a recovery period without 429
+API_MIN_QUOTA_FACTOR = 0.125
+API_RECOVERY_SECONDS = 600
+
 OFFLINE_DELAY = 17 * 60
 
+# Cost data of a site is fetched this long after the first refresh request,
+# at most once per minimum interval, and sites due at the same time are
+# fetched this many seconds apart
+COST_REFRESH_DELAY_SECONDS = 60
+COST_MIN_INTERVAL_SECONDS = 1200
+COST_STAGGER_SECONDS = 5
+# Time after midnight until the cloud is expected to have all cost data of
+# the day before, periods ending today fetched earlier are fetched again
+COST_SETTLE_SECONDS = 3 * 3600
 
-class CostData:
-    """Representation of Cost data."""
+# Time to wait for the stream to resend current state after a reconnect
+# before polling the products that missed data
+STREAM_GAP_GRACE_SECONDS = 30
 
-    def __init__(
-        self,
-        site: Site,
-        period: int,
-    ):
-        """Initialize the cost data."""
-        self.site: Site = site
-        self.period: int = period
-        self.request_queue = asyncio.Queue()
-        self.observers = {}
-        self.task = asyncio.create_task(
-            self.request_handler(), name="easee_hass cost update task"
+STREAM_CAPTURE_SIZE = 100000
+STREAM_CAPTURE_FILE = "easee_stream_capture.jsonl"
+
+UNSUPPORTED_OBSERVATION = (None, None, None)
+
+EMPTY_COST = {"totalEnergyUsage": 0, "totalCost": 0, "currencyId": ""}
+
+# Entity definitions are converted once and shared by all products
+CHARGER_ENTITY_DESCRIPTIONS = get_entity_descriptions(
+    {**MANDATORY_EASEE_ENTITIES, **OPTIONAL_EASEE_ENTITIES}, "sensor"
+)
+EQUALIZER_ENTITY_DESCRIPTIONS = get_entity_descriptions(EASEE_EQ_ENTITIES, "eq_sensor")
+
+# Observations that update other fields than their own, or are used
+# internally, mapped to the observed fields that need them. None means
+# that the observation is always needed.
+OBSERVATION_DEPENDENCIES = {
+    ("state", "chargerOpMode"): None,
+    # Compared by the current limit services to skip unchanged limits
+    **dict.fromkeys(
+        [
+            ("state", "dynamicCircuitCurrentP1"),
+            ("state", "dynamicCircuitCurrentP2"),
+            ("state", "dynamicCircuitCurrentP3"),
+            ("config", "circuitMaxCurrentP1"),
+            ("config", "circuitMaxCurrentP2"),
+            ("config", "circuitMaxCurrentP3"),
+            ("state", "offlineMaxCircuitCurrentP1"),
+            ("state", "offlineMaxCircuitCurrentP2"),
+            ("state", "offlineMaxCircuitCurrentP3"),
+            ("state", "dynamicChargerCurrent"),
+            ("config", "maxChargerCurrent"),
+        ]
+    ),
+    ("state", "lifetimeEnergy"): [("state", "lifetimeEnergy"), ("cost", "totalCost")],
+    ("config", "surplusCharging"): [
+        ("config", "surplusChargingMode"),
+        ("config", "surplusChargingCurrent"),
+    ],
+}
+
+# Time window in seconds used to collect entity updates before they are
+# written, 0 means the updates are written on the next event loop iteration
+UPDATE_COALESCE_WINDOW = 0
+
+
+def get_topology(sites):
+    """Get the site, circuit, charger and equalizer structure of sites."""
+    return [
+        (
+            site.id,
+            site.name,
+            [
+                (
+                    circuit["id"],
+                    [
+                        (charger["id"], charger["name"])
+                        for charger in circuit.get("chargers") or []
+                    ],
+                )
+                for circuit in site.get("circuits") or []
+            ],
+            [
+                (equalizer["id"], equalizer["name"])
+                for equalizer in site.get("equalizers") or []
+            ],
+        )
+        for site in sites
+    ]
+
+
+def update_data(target, source, skip=()):
+    """Update data of a pyeasee object in place."""
+    for key, value in source.get_data().items():
+        if key not in skip:
+            target[key] = value
+
+
+class UpdateCoalescer:
+    """Collect entity update requests and flush each entity once."""
+
+    def __init__(self, hass: HomeAssistant, window: float = UPDATE_COALESCE_WINDOW):
+        """Initialize the coalescer."""
+        self.hass = hass
+        self.window = window
+        self.pending = {}
+        self.handle = None
+        self.requested = 0
+        self.flushed = 0
+
+    @callback
+    def async_request_update(self, entity):
+        """Mark an entity as dirty and schedule a flush."""
+        self.requested += 1
+        self.pending[entity] = None
+        if self.handle is None:
+            if self.window > 0:
+                self.handle = self.hass.loop.call_later(self.window, self.async_flush)
+            else:
+                self.handle = self.hass.loop.call_soon(self.async_flush)
+
+    @callback
+    def async_flush(self):
+        """Update all dirty entities."""
+        self.handle = None
+        pending = self.pending
+        self.pending = {}
+        for entity in pending:
+            if entity.enabled and entity.hass is not None:
+                # One failing entity must not drop the updates of the others
+                try:
+                    entity.async_push_update()
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.exception("Failed to update %s: %s", entity.entity_id, err)
+                    continue
+                self.flushed += 1
+
+    @callback
+    def async_cancel(self):
+        """Cancel a pending flush."""
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.pending = {}
+
+    def get_statistics(self):
+        """Return update counters."""
+        return {
+            "requested": self.requested,
+            "written": self.flushed,
+            "saved": self.requested - self.flushed - len(self.pending),
+        }
+
+
+class StreamCapture:
+    """Record stream callbacks in a bounded ring buffer."""
+
+    __slots__ = ("events", "start")
+
+    def __init__(self, size: int = STREAM_CAPTURE_SIZE):
+        """Initialize the capture."""
+        self.events = deque(maxlen=size)
+        self.start = time.monotonic()
+
+    def record(self, product_id, data_type, data_id, value):
+        """Record one stream callback."""
+        self.events.append(
+            (
+                round(time.monotonic() - self.start, 3),
+                product_id,
+                data_type,
+                data_id,
+                value,
+            )
+        )
+
+    def dump(self, path):
+        """Write the events to a file, one compact JSON array per line.
+
+        Each line is [seconds since start, product id, data type, data id, value].
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            for event in self.events:
+                file.write(json.dumps(event, separators=(",", ":"), default=str))
+                file.write("\n")
+
+    @staticmethod
+    def load(path):
+        """Read events written by dump."""
+        with open(path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+
+def get_api_endpoint(method, url):
+    """Get the budget bucket, quota and priority of a cloud call."""
+    path = url.partition("?")[0]
+    if method != "GET":
+        return "command", "command", API_PRIORITY_COMMAND
+    if match := re.match(r"/api/sites/(\d+)/breakdown/", path):
+        return f"cost {match[1]}", "cost", API_PRIORITY_BACKGROUND
+    if path.startswith("/firmware/") or path.endswith("/partners"):
+        return "firmware", "firmware", API_PRIORITY_BACKGROUND
+    if path.startswith("/api/sessions/") or "/usage/" in path:
+        return "history", "history", API_PRIORITY_BACKGROUND
+    return "state", "state", API_PRIORITY_STATE
+
+
+class TokenBucket:
+    """Token bucket refilled evenly over a period."""
+
+    __slots__ = ("capacity", "period", "quota", "tokens", "updated")
+
+    def __init__(self, quota: int, period: float):
+        """Initialize a full bucket."""
+        self.quota = quota
+        self.period = period
+        self.capacity = float(quota)
+        self.tokens = float(quota)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        """Add the tokens earned since last refill."""
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.capacity / self.period,
+        )
+        self.updated = now
+
+    def get_delay(self, now, reserve=0.0):
+        """Get the seconds until a token is available above the reserve."""
+        self.refill(now)
+        missing = 1 + reserve * self.capacity - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing * self.period / self.capacity
+
+    def scale(self, factor):
+        """Change the capacity to a part of the quota."""
+        self.capacity = max(1.0, self.quota * factor)
+        self.tokens = min(self.tokens, self.capacity)
+
+
+class ApiBudget:
+    """Budget for calls to the Easee cloud.
+
+    Every REST call of the Easee client waits for a token from the general
+    bucket and from the bucket of its endpoint class. Lower priorities leave
+    a reserve of the general bucket for higher ones. A 429 answer pauses all
+    calls for the time asked by the server and shrinks the quotas, which
+    are restored step by step when no 429 has been seen for a while.
+    """
+
+    __slots__ = (
+        "blocked_until",
+        "buckets",
+        "factor",
+        "last_rate_limited",
+        "statistics",
+    )
+
+    def __init__(self):
+        """Initialize the budget."""
+        self.buckets: dict[str, TokenBucket] = {
+            "general": TokenBucket(*API_QUOTAS["general"])
+        }
+        self.factor = 1.0
+        self.blocked_until = 0.0
+        self.last_rate_limited = None
+        self.statistics = {}
+
+    def install(self, easee):
+        """Send all REST calls of an Easee client through the budget."""
+        for method in ("get", "post", "put", "delete"):
+            setattr(easee, method, self.wrap(method.upper(), getattr(easee, method)))
+
+    def wrap(self, method, func):
+        """Get a function calling func within the budget."""
+
+        async def async_call(url, **kwargs):
+            key, quota, priority = get_api_endpoint(method, url)
+            await self.async_acquire(key, quota, priority)
+            try:
+                return await func(url, **kwargs)
+            except TooManyRequestsException as err:
+                self.rate_limited(key, err)
+                raise
+
+        return async_call
+
+    def get_bucket(self, key, quota):
+        """Get the bucket of an endpoint, created on first use."""
+        if (bucket := self.buckets.get(key)) is None:
+            bucket = self.buckets[key] = TokenBucket(*API_QUOTAS[quota])
+            bucket.scale(self.factor)
+        return bucket
+
+    def get_statistics_entry(self, key):
+        """Get the statistics of an endpoint."""
+        if (stats := self.statistics.get(key)) is None:
+            stats = self.statistics[key] = {
+                "calls": 0,
+                "delayed": 0,
+                "wait": 0.0,
+                "rate_limited": 0,
+            }
+        return stats
+
+    def get_delay(self, priority=API_PRIORITY_STATE, method=None, url=None):
+        """Get the seconds a call of a priority would have to wait at least.
+
+        The bucket of the endpoint is included if its method and url are given.
+        """
+        now = time.monotonic()
+        delay = max(
+            self.blocked_until - now,
+            self.buckets["general"].get_delay(now, API_PRIORITY_RESERVE[priority]),
+        )
+        if url is not None:
+            key, quota, _ = get_api_endpoint(method, url)
+            delay = max(delay, self.get_bucket(key, quota).get_delay(now))
+        return delay
+
+    async def async_wait_for_reserve(self, method, url, reserve):
+        """Wait until an endpoint keeps a reserve of its quota after a call.
+
+        Lets background jobs leave the given part of an endpoint quota to
+        the live updates sharing it.
+        """
+        key, quota, _ = get_api_endpoint(method, url)
+        bucket = self.get_bucket(key, quota)
+        while (delay := bucket.get_delay(time.monotonic(), reserve)) > 0:
+            _LOGGER.debug("API budget holds back %s call by %.1f s", key, delay)
+            await asyncio.sleep(delay)
+
+    async def async_acquire(self, key, quota, priority):
+        """Wait until the budget allows a call."""
+        general = self.buckets["general"]
+        bucket = self.get_bucket(key, quota)
+        reserve = API_PRIORITY_RESERVE[priority]
+        stats = self.get_statistics_entry(key)
+        start = None
+        while True:
+            now = time.monotonic()
+            self.recover(now)
+            delay = max(
+                self.blocked_until - now,
+                general.get_delay(now, reserve),
+                bucket.get_delay(now),
+            )
+            if delay <= 0:
+                break
+            _LOGGER.debug("API budget delays %s call by %.1f s", key, delay)
+            if start is None:
+                start = now
+            await asyncio.sleep(delay)
+
+        general.tokens -= 1
+        bucket.tokens -= 1
+        stats["calls"] += 1
+        if start is not None:
+            stats["delayed"] += 1
+            stats["wait"] = round(stats["wait"] + now - start, 3)
+
+    def rate_limited(self, key, err):
+        """Pause calls and shrink the quotas after a 429 answer."""
+        try:
+            retry_after = int(err.args[1])
+        except (IndexError, TypeError, ValueError):
+            retry_after = RATE_LIMIT_BACKOFF_SECONDS
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.last_rate_limited = now
+        self.set_factor(max(API_MIN_QUOTA_FACTOR, self.factor / 2))
+        self.get_statistics_entry(key)["rate_limited"] += 1
+        _LOGGER.warning(
+            "Rate limited by Easee on %s, pausing calls for %s s and reducing"
+            " the API budget to %.0f%%",
+            key,
+            retry_after,
+            self.factor * 100,
         )
 
+    def recover(self, now):
+        """Grow the quotas again when no 429 has been seen for a while."""
+        if (
+            self.last_rate_limited is not None
+            and now - self.last_rate_limited > API_RECOVERY_SECONDS
+        ):
+            self.set_factor(min(1.0, self.factor * 2))
+            self.last_rate_limited = None if self.factor == 1.0 else now
+
+    def set_factor(self, factor):
+        """Scale all quotas."""
+        self.factor = factor
+        for bucket in self.buckets.values():
+            bucket.scale(factor)
+
+    def get_statistics(self):
+        """Get budget statistics."""
+        return {
+            "quota_factor": self.factor,
+            "blocked_for": max(0.0, round(self.blocked_until - time.monotonic(), 1)),
+            "endpoints": self.statistics,
+        }
+
+
+class CostScheduler:
+    """Single task fetching cost data for all sites.
+
+    Refresh requests are collected per site. A site is fetched a while after
+    its first request, so that the requests of all its chargers are served
+    by one fetch, and not again within the minimum interval. Sites that are
+    due at the same time are fetched one after the other, spaced out to
+    spread the calls over the API budget.
+    """
+
+    __slots__ = ("last_fetch", "pending", "statistics", "task", "wakeup")
+
+    def __init__(self):
+        """Initialize the scheduler."""
+        self.pending: dict[CostData, float] = {}
+        self.last_fetch: dict[CostData, float] = {}
+        self.statistics = {
+            "fetches": 0,
+            "failures": 0,
+            "last_fetch_latency": None,
+            "max_queue_depth": 0,
+        }
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        """Start the scheduler task."""
+        if self.task is None:
+            self.task = asyncio.create_task(
+                self.async_run(), name="easee_hass cost update task"
+            )
+
     async def async_cleanup(self) -> None:
-        """Cancel our consumer task."""
+        """Cancel the scheduler task."""
+        if self.task is None:
+            return
         self.task.cancel()
         try:
             await self.task
@@ -106,70 +588,274 @@ class CostData:
             _LOGGER.debug("Cost update task cancelled")
         self.task = None
 
+    def request_update(self, cost_data):
+        """Schedule a fetch of the cost data of a site."""
+        if cost_data in self.pending:
+            return
+        now = time.monotonic()
+        due = now + COST_REFRESH_DELAY_SECONDS
+        if (last := self.last_fetch.get(cost_data)) is not None:
+            due = max(due, last + COST_MIN_INTERVAL_SECONDS)
+        self.pending[cost_data] = due
+        self.statistics["max_queue_depth"] = max(
+            self.statistics["max_queue_depth"], len(self.pending)
+        )
+        _LOGGER.debug(
+            "Cost refresh for site %s in %.0f s", cost_data.site.id, due - now
+        )
+        self.wakeup.set()
+
+    async def async_run(self):
+        """Fetch cost data of sites when due."""
+        while True:
+            self.wakeup.clear()
+            if not self.pending:
+                await self.wakeup.wait()
+                continue
+            cost_data = min(self.pending, key=self.pending.get)
+            delay = self.pending[cost_data] - time.monotonic()
+            if delay > 0:
+                with suppress(TimeoutError):
+                    async with asyncio.timeout(delay):
+                        await self.wakeup.wait()
+                continue
+
+            del self.pending[cost_data]
+            start = time.monotonic()
+            self.last_fetch[cost_data] = start
+            try:
+                updated = await cost_data.update_cost()
+            except Exception as err:  # pylint: disable=broad-except
+                # Keep the task running for the other sites and later fetches
+                _LOGGER.exception(
+                    "Unexpected error refreshing cost of site %s: %s",
+                    cost_data.site.id,
+                    err,
+                )
+                updated = False
+            if not updated:
+                self.statistics["failures"] += 1
+            self.statistics["fetches"] += 1
+            self.statistics["last_fetch_latency"] = round(time.monotonic() - start, 3)
+            if self.pending:
+                await asyncio.sleep(COST_STAGGER_SECONDS)
+
+    def get_statistics(self):
+        """Get scheduler statistics."""
+        return {"queue_depth": len(self.pending), **self.statistics}
+
+
+class CostData:
+    """Representation of Cost data.
+
+    Costs of closed periods never change, so they are cached per charger:
+    the year up to the start of this month as one total, and this month up
+    to today as daily totals. A refresh then only asks for today's cost,
+    plus any period missing from the cache after a day or month change.
+    Periods fetched right after midnight may lack late cloud data, so they
+    are fetched once more when the day has settled. Month and year costs
+    are derived from the cache and today's cost.
+    """
+
+    __slots__ = (
+        "chargers",
+        "currency",
+        "observers",
+        "periods",
+        "provisional",
+        "scheduler",
+        "site",
+    )
+
+    def __init__(self, site: Site, scheduler: CostScheduler):
+        """Initialize the cost data."""
+        self.site: Site = site
+        self.scheduler = scheduler
+        self.observers = {}
+        # Cached periods, key is "year" or the ISO start date of a period of
+        # this month, value the ISO end date (exclusive)
+        self.periods: dict[str, str] = {}
+        # Energy and cost per charger for each cached period
+        self.chargers: dict[str, dict[str, list[float]]] = {}
+        # Cached periods fetched before the day they end on had settled
+        self.provisional: set[str] = set()
+        self.currency = None
+
     def register_for_update(self, product_id, cost_callback):
         """Register callback for data update."""
         self.observers[product_id] = cost_callback
         _LOGGER.debug("Cost refresh callback registered for %s.", product_id)
 
     def request_update(self, product_id):
-        """Add a request to queue."""
-        self.request_queue.put_nowait(product_id)
+        """Ask the scheduler for a refresh."""
         _LOGGER.debug("Cost refresh requested for %s.", product_id)
-
-    async def request_handler(self):
-        """Update cost data task."""
-        while True:
-            product_id = await self.request_queue.get()
-            await asyncio.sleep(self.period)
-            _LOGGER.debug("Cost refresh for %s", product_id)
-            self.request_queue.task_done()
-            while not self.request_queue.empty():
-                product_id = await self.request_queue.get()
-                _LOGGER.debug("Cost refresh for %s", product_id)
-                self.request_queue.task_done()
-
-            await self.update_cost()
-            # Wait to comply with rate limit (max 10 calls/hour)
-            await asyncio.sleep(1200 - self.period)
+        self.scheduler.request_update(self)
+
+    def get_snapshot(self):
+        """Get the cache to persist."""
+        return {
+            "periods": self.periods,
+            "chargers": self.chargers,
+            "currency": self.currency,
+            "provisional": sorted(self.provisional),
+        }
+
+    def restore_snapshot(self, snapshot):
+        """Restore a cache saved by get_snapshot."""
+        self.periods = dict(snapshot.get("periods", {}))
+        self.chargers = {
+            charger_id: dict(totals)
+            for charger_id, totals in snapshot.get("chargers", {}).items()
+        }
+        self.currency = snapshot.get("currency")
+        self.provisional = set(snapshot.get("provisional", []))
+
+    def get_missing_periods(self, today):
+        """Get the closed periods of this year that are not cached."""
+        month_start = today.replace(day=1)
+        missing = []
+        if self.periods.get("year") != month_start.isoformat():
+            missing.append(("year", today.replace(month=1, day=1), month_start))
+
+        start = month_start
+        for key, end in sorted(
+            (key, end) for key, end in self.periods.items() if key != "year"
+        ):
+            if key > start.isoformat():
+                missing.append((start.isoformat(), start, date.fromisoformat(key)))
+            start = max(start, date.fromisoformat(end))
+        if start < today:
+            missing.append((start.isoformat(), start, today))
+        return missing
+
+    def prune(self, today):
+        """Drop the days of earlier months, the year total covers them."""
+        month_start = today.replace(day=1).isoformat()
+        for key in [key for key in self.periods if key != "year"]:
+            if key < month_start:
+                self.drop_period(key)
+
+    def drop_period(self, key):
+        """Remove a period from the cache."""
+        self.periods.pop(key, None)
+        self.provisional.discard(key)
+        for totals in self.chargers.values():
+            totals.pop(key, None)
+
+    async def async_get_costs(self, start, end):
+        """Get the costs between two local dates or datetimes."""
+        if not isinstance(start, datetime):
+            start = dt_util.start_of_local_day(start)
+        if not isinstance(end, datetime):
+            end = dt_util.start_of_local_day(end)
+        costs = await self.site.get_cost_between_dates(
+            dt_util.as_utc(start), dt_util.as_utc(end)
+        )
+        if costs is None:
+            raise ValueError("No cost data returned")
+        for cost in costs:
+            if cost.get("currencyId"):
+                self.currency = cost["currencyId"]
+        return costs
 
     async def update_cost(self):
         """Poll cost data and notify observers."""
+        now = dt_util.now().replace(microsecond=0)
+        today = now.date()
+        settled = (
+            now - dt_util.start_of_local_day(today)
+        ).total_seconds() >= COST_SETTLE_SECONDS
+        self.prune(today)
+        if settled:
+            for key in list(self.provisional):
+                self.drop_period(key)
         try:
-            dt_end = dt_util.now().replace(microsecond=0)
-            dt_start = dt_util.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            costs_day = await self.site.get_cost_between_dates(
-                dt_util.as_utc(dt_start), dt_util.as_utc(dt_end)
-            )
-            await asyncio.sleep(1)
-            dt_start = dt_start.replace(day=1)
-            costs_month = await self.site.get_cost_between_dates(
-                dt_util.as_utc(dt_start), dt_util.as_utc(dt_end)
-            )
-            await asyncio.sleep(1)
-            dt_start = dt_start.replace(month=1)
-            costs_year = await self.site.get_cost_between_dates(
-                dt_util.as_utc(dt_start), dt_util.as_utc(dt_end)
-            )
+            for key, start, end in self.get_missing_periods(today):
+                self.drop_period(key)
+                if start < end:
+                    costs = await self.async_get_costs(start, end)
+                    for cost in costs:
+                        self.chargers.setdefault(cost["chargerId"], {})[key] = [
+                            cost.get("totalEnergyUsage") or 0,
+                            cost.get("totalCost") or 0,
+                        ]
+                self.periods[key] = end.isoformat()
+                if not settled and end == today:
+                    self.provisional.add(key)
+            costs_day = await self.async_get_costs(today, now)
         except Exception as ex:
             _LOGGER.error("Cost refresh failed with exception %s", ex)
-        else:
-            _LOGGER.debug("Cost refreshed %s %s %s", costs_day, costs_month, costs_year)
-            self.notify_observers(costs_day, "day")
-            self.notify_observers(costs_month, "month")
-            self.notify_observers(costs_year, "year")
+            return False
 
-    def notify_observers(self, costs, name):
-        """Send notification to observers."""
-        if costs is not None:
-            for cost in costs:
-                charger_id = cost["chargerId"]
-                if charger_id in self.observers:
-                    self.observers[charger_id](name, cost)
+        _LOGGER.debug("Cost refreshed %s, cached periods %s", costs_day, self.periods)
+        today_costs = {cost["chargerId"]: cost for cost in costs_day}
+        for charger_id, cost_callback in self.observers.items():
+            cost = today_costs.get(charger_id, {})
+            energy = cost.get("totalEnergyUsage") or 0
+            total = cost.get("totalCost") or 0
+            cost_callback("day", self.make_cost(energy, total))
+
+            cached = self.chargers.get(charger_id, {})
+            for key, (period_energy, period_cost) in cached.items():
+                if key != "year":
+                    energy += period_energy
+                    total += period_cost
+            cost_callback("month", self.make_cost(energy, total))
+
+            year_energy, year_cost = cached.get("year", (0, 0))
+            cost_callback(
+                "year", self.make_cost(energy + year_energy, total + year_cost)
+            )
+        return True
+
+    def make_cost(self, energy, cost):
+        """Get a cost record like the ones returned by the cloud."""
+        return {
+            "totalEnergyUsage": round(energy, 3),
+            "totalCost": round(cost, 3),
+            "currencyId": self.currency or self.site.get("currencyId", ""),
+        }
 
 
 class ProductData:
     """Representation product data."""
 
+    __slots__ = (
+        "backfill_due",
+        "backfill_since",
+        "circuit",
+        "config",
+        "cost_base",
+        "cost_data",
+        "cost_day",
+        "cost_month",
+        "cost_reference",
+        "cost_year",
+        "deadbands",
+        "delivered",
+        "device_info",
+        "firmware_auth_failure",
+        "last_poll",
+        "last_stream_message",
+        "master",
+        "observations",
+        "observers",
+        "operator_auth_failure",
+        "poll_observations",
+        "product",
+        "required_observations",
+        "schedule",
+        "site",
+        "state",
+        "streamdata",
+        "update_coalescer",
+        "updates_delivered",
+        "updates_suppressed",
+        "weekly_schedule",
+    )
+
+    _observation_tables: dict = {}
+
     def __init__(
         self,
         product,
@@ -179,9 +865,12 @@ class ProductData:
         circuit: Circuit = None,
         master=False,
         cost_data: CostData | None = None,
+        update_coalescer: UpdateCoalescer | None = None,
+        device_info: DeviceInfo | None = None,
     ):
         """Initialize the product data."""
         self.product = product
+        self.device_info = device_info
         self.circuit: Circuit = circuit
         self.site: Site = site
         self.state = None
@@ -189,19 +878,35 @@ class ProductData:
         self.schedule = None
         self.weekly_schedule = None
         self.observers = {}
+        self.deadbands = {}
+        self.delivered = {"state": {}, "config": {}}
+        self.updates_delivered = 0
+        self.updates_suppressed = 0
+        self.update_coalescer = update_coalescer
         self.cost_data: CostData = cost_data
         if self.cost_data is not None:
             self.cost_data.register_for_update(self.product.id, self.cost_update)
-        self.cost_day = {"totalEnergyUsage": 0, "totalCost": 0, "currencyId": ""}
-        self.cost_month = {"totalEnergyUsage": 0, "totalCost": 0, "currencyId": ""}
-        self.cost_year = {"totalEnergyUsage": 0, "totalCost": 0, "currencyId": ""}
+        # Cost dicts are replaced, never modified, so the empty one is shared
+        self.cost_day = EMPTY_COST
+        self.cost_month = EMPTY_COST
+        self.cost_year = EMPTY_COST
+        # Last cloud costs and the lifetime energy and date they were
+        # received at, used to compute costs locally until the next ones
+        self.cost_base = {}
+        self.cost_reference = None
         self.streamdata = streamdata
+        self.observations = self.observation_table(streamdata)
         self.poll_observations = poll_observations
+        self.required_observations = None
         self.master = master
+        self.last_poll = None
+        self.last_stream_message = None
+        self.backfill_due = None
+        self.backfill_since = None
         self.firmware_auth_failure = None
         self.operator_auth_failure = None
 
-    def register_for_update(self, name, entity):
+    def register_for_update(self, name, entity, deadband=None):
         """Register a entity to watch changes."""
         _LOGGER.debug("Register for updates on %s", name)
 
@@ -216,6 +921,48 @@ class ProductData:
                 self.observers[first][second] = []
             self.observers[first][second].append(entity)
 
+            # A field only gets a deadband if all its observers accept one
+            deadbands = self.deadbands.setdefault(first, {})
+            if deadband is None or deadbands.get(second, deadband) is None:
+                deadbands[second] = None
+            else:
+                deadbands[second] = min(deadband, deadbands.get(second, deadband))
+
+    def unregister_for_update(self, entity):
+        """Stop sending updates to an entity."""
+        for observers in self.observers.values():
+            for index, entities in observers.items():
+                if entity in entities:
+                    observers[index] = [
+                        observer for observer in entities if observer is not entity
+                    ]
+        self.invalidate_poll_observations()
+
+    def has_changed(self, target, index, value):
+        """Check if a value differs from the one last delivered to observers."""
+        delivered = self.delivered[target]
+        if index in delivered:
+            previous = delivered[index]
+            deadband = self.deadbands.get(target, {}).get(index)
+            if deadband is None:
+                unchanged = previous == value
+            else:
+                try:
+                    unchanged = abs(value - previous) < deadband
+                except TypeError:
+                    unchanged = previous == value
+            if unchanged:
+                self.updates_suppressed += 1
+                return False
+
+        delivered[index] = value
+        self.updates_delivered += 1
+        return True
+
+    def reset_change_detection(self, target, index):
+        """Make sure the next value received for a field is delivered."""
+        self.delivered[target].pop(index, None)
+
     def is_state_polled(self):
         """Check if state is polled."""
         return self.state is not None
@@ -228,6 +975,88 @@ class ProductData:
         """Check if master."""
         return self.master
 
+    def get_poll_interval(self, stream_connected, interval):
+        """Get the poll interval based on stream health and product activity."""
+        if stream_connected:
+            # Only a slow consistency check is needed when the stream is up
+            return SCAN_INTERVAL_STREAM_SECONDS
+        if self.state is None:
+            return interval
+        if self.state.get("isOnline") is False:
+            return SCAN_INTERVAL_IDLE_SECONDS
+        op_mode = self.state.get("chargerOpMode")
+        if op_mode in CHARGING_OP_MODES:
+            return min(interval, SCAN_INTERVAL_CHARGING_SECONDS)
+        if op_mode in IDLE_OP_MODES:
+            return SCAN_INTERVAL_IDLE_SECONDS
+        return interval
+
+    def get_poll_observations(self):
+        """Get the observation ids needed by the enabled entities."""
+        if self.required_observations is None:
+            self.required_observations = {
+                data_id
+                for data_id in self.poll_observations
+                if self.is_observation_needed(
+                    *self.observations.get(data_id, UNSUPPORTED_OBSERVATION)[:2]
+                )
+            }
+            _LOGGER.debug(
+                "Observations needed for %s: %d of %d",
+                self.product.id,
+                len(self.required_observations),
+                len(self.poll_observations),
+            )
+        return self.required_observations
+
+    def is_observation_needed(self, target, field):
+        """Check if an observation is used by any enabled entity."""
+        if target is None:
+            return False
+        if target == "schedule":
+            return any(
+                self.check_enabled(index, self.observers.get(name, {}))
+                for name in ("schedule", "weekly_schedule")
+                for index in self.observers.get(name, {})
+            )
+        dependencies = OBSERVATION_DEPENDENCIES.get((target, field), [(target, field)])
+        if dependencies is None:
+            return True
+        return any(
+            self.check_enabled(index, self.observers.get(name, {}))
+            for name, index in dependencies
+        )
+
+    def invalidate_poll_observations(self):
+        """Recompute the needed observations on next poll."""
+        self.required_observations = None
+
+    def is_poll_due(self, stream_connected, interval):
+        """Check if it is time to poll the product."""
+        if self.last_poll is None:
+            return True
+        elapsed = time.monotonic() - self.last_poll
+        return elapsed >= self.get_poll_interval(stream_connected, interval)
+
+    def mark_stream_gap(self, reconnected):
+        """Poll the product after a stream gap unless the stream resends state."""
+        self.backfill_since = reconnected
+        self.backfill_due = reconnected + STREAM_GAP_GRACE_SECONDS
+
+    def is_backfill_due(self):
+        """Check if data missed during a stream gap needs to be polled."""
+        if self.backfill_due is None or time.monotonic() < self.backfill_due:
+            return False
+        if (
+            self.backfill_since is not None
+            and self.last_stream_message is not None
+            and self.last_stream_message >= self.backfill_since
+        ):
+            # Current state was resent by the stream after reconnecting
+            self.backfill_due = None
+            return False
+        return True
+
     async def async_firmware_refresh(self):
         """Poll latest firmware version."""
         if self.state is None:
@@ -276,8 +1105,27 @@ class ProductData:
         """Poll observations."""
 
         if poll_observations is None:
-            poll_observations = self.poll_observations
+            poll_observations = self.get_poll_observations()
+
+        await self.async_init_data()
 
+        if not poll_observations:
+            _LOGGER.debug("No enabled entities to poll for %s", self.product.id)
+            return
+
+        _LOGGER.debug(
+            "Polling state for %s using %s", self.product.id, poll_observations
+        )
+        observations = await self.product.get_observations(*poll_observations)
+        for observation in observations["observations"]:
+            data_id = observation["id"]
+            value = observation["value"]
+            data_type = observation["dataType"]
+
+            await self.async_update_observation(data_type, data_id, value)
+
+    async def async_init_data(self):
+        """Create empty state and config if not done yet."""
         if self.state is None:
             self.state = await self.product.empty_state(raw=True)
             self.state["voltageNL1"] = None
@@ -290,16 +1138,52 @@ class ProductData:
         if self.config is None:
             self.config = await self.product.empty_config(raw=True)
 
-        _LOGGER.debug(
-            "Polling state for %s using %s", self.product.id, poll_observations
-        )
-        observations = await self.product.get_observations(*poll_observations)
-        for observation in observations["observations"]:
-            data_id = observation["id"]
-            value = observation["value"]
-            data_type = observation["dataType"]
-
-            await self.async_update_observation(data_type, data_id, value)
+    def get_snapshot(self):
+        """Get the data to persist for a warm start."""
+        if self.state is None:
+            return None
+        snapshot = {
+            "state": {
+                key: value
+                for key, value in self.state.get_data().items()
+                if key not in TRANSIENT_STATE
+            },
+            "config": dict(self.config.get_data()),
+            "cost_day": self.cost_day,
+            "cost_month": self.cost_month,
+            "cost_year": self.cost_year,
+        }
+        if self.schedule is not None:
+            snapshot["schedule"] = dict(self.schedule.get_data())
+        if self.weekly_schedule is not None:
+            snapshot["weekly_schedule"] = dict(self.weekly_schedule.get_data())
+        return snapshot
+
+    async def async_restore_snapshot(self, snapshot, saved):
+        """Restore data saved by get_snapshot."""
+        await self.async_init_data()
+        for key, value in snapshot.get("state", {}).items():
+            self.state[key] = value
+        for key, value in snapshot.get("config", {}).items():
+            self.config[key] = value
+        if "schedule" in snapshot:
+            self.schedule = ChargerSchedule({"isEnabled": False})
+            for key, value in snapshot["schedule"].items():
+                self.schedule[key] = value
+        if "weekly_schedule" in snapshot:
+            self.weekly_schedule = ChargerWeeklySchedule({"isEnabled": False})
+            for key, value in snapshot["weekly_schedule"].items():
+                self.weekly_schedule[key] = value
+
+        # Costs are only valid for the period they were fetched in
+        today = dt_util.now().date()
+        if saved is not None:
+            if saved == today:
+                self.cost_day = snapshot.get("cost_day", self.cost_day)
+            if saved.year == today.year and saved.month == today.month:
+                self.cost_month = snapshot.get("cost_month", self.cost_month)
+            if saved.year == today.year:
+                self.cost_year = snapshot.get("cost_year", self.cost_year)
 
     async def async_schedules_interpret(self, data):
         """Interpret schedule data."""
@@ -310,6 +1194,8 @@ class ProductData:
 
         self.schedule = ChargerSchedule({"isEnabled": False})
         self.weekly_schedule = ChargerWeeklySchedule({"isEnabled": False})
+        self.invalidate_all_attributes("schedule")
+        self.invalidate_all_attributes("weekly_schedule")
 
         # Weekly schedule
         if kind == "Recurring" and recurrency == "Weekly":
@@ -361,8 +1247,65 @@ class ProductData:
         if "year" in cost_type:
             self.cost_year = cost_data
 
+        # The cloud figures replace the local ones, energy charged from now
+        # on is added to them
+        self.cost_base[cost_type] = cost_data
+        energy = self.state.get("lifetimeEnergy") if self.state is not None else None
+        self.cost_reference = None if energy is None else (dt_util.now().date(), energy)
+
+        self.invalidate_all_attributes("cost")
+        self.notify("totalCost", self.observers["cost"])
+
+    def update_local_cost(self):
+        """Add the cost of energy charged since the last cloud costs."""
+        if (
+            self.cost_data is None
+            or self.cost_reference is None
+            or len(self.cost_base) < 3
+        ):
+            return
+        energy = self.state.get("lifetimeEnergy")
+        price = self.site.get("costPerKWh")
+        if energy is None or not price:
+            return
+        reference_date, reference_energy = self.cost_reference
+        delta = energy - reference_energy
+        if delta < 0:
+            return
+
+        today = dt_util.now().date()
+        if today == reference_date:
+            if delta == 0:
+                return
+        else:
+            # Start new periods from the costs charged up to now
+            base = {
+                name: self.add_cost(self.cost_base[name], delta, price)
+                for name in ("day", "month", "year")
+            }
+            base["day"] = EMPTY_COST
+            if (today.year, today.month) != (reference_date.year, reference_date.month):
+                base["month"] = EMPTY_COST
+            if today.year != reference_date.year:
+                base["year"] = EMPTY_COST
+            self.cost_base = base
+            self.cost_reference = (today, energy)
+            delta = 0
+
+        self.cost_day = self.add_cost(self.cost_base["day"], delta, price)
+        self.cost_month = self.add_cost(self.cost_base["month"], delta, price)
+        self.cost_year = self.add_cost(self.cost_base["year"], delta, price)
+        self.invalidate_all_attributes("cost")
         self.notify("totalCost", self.observers["cost"])
 
+    def add_cost(self, cost, energy, price):
+        """Get a cost record with the cost of some energy added."""
+        return {
+            "totalEnergyUsage": round((cost.get("totalEnergyUsage") or 0) + energy, 3),
+            "totalCost": round((cost.get("totalCost") or 0) + energy * price, 3),
+            "currencyId": cost.get("currencyId") or self.site.get("currencyId", ""),
+        }
+
     async def async_cost_refresh(self):
         """Ask for cost data update."""
         if self.cost_data is not None:
@@ -398,6 +1341,17 @@ class ProductData:
         if self.state is None:
             return False
 
+        received = time.monotonic()
+        if (
+            self.last_stream_message is not None
+            and received - self.last_stream_message > OFFLINE_DELAY
+        ):
+            # Product was silent for a while, changes may have been missed
+            _LOGGER.debug("Stream gap detected for %s", self.product.id)
+            self.backfill_since = None
+            self.backfill_due = received
+        self.last_stream_message = received
+
         now = dt_util.utcnow().replace(microsecond=0)
         self.set_state("signalRConnected", True, False)
         self.set_state("latestPulse", now, False)
@@ -405,12 +1359,44 @@ class ProductData:
 
         return await self.async_update_observation(data_type, data_id, value)
 
+    @classmethod
+    def observation_table(cls, streamdata):
+        """Return the observation dispatch table for a stream data class.
+
+        The table maps a data id to a (target, field, hook) tuple and is built
+        once per stream data class. Ids that are looked up but not supported
+        are added as negative entries the first time they are seen.
+        """
+        table = cls._observation_tables.get(streamdata)
+        if table is not None:
+            return table
+
+        hooks = {
+            ("state", "lifetimeEnergy"): cls._async_lifetime_energy_updated,
+            ("config", "surplusCharging"): cls._async_surplus_charging_updated,
+        }
+        table = {}
+        for member in streamdata:
+            parts = member.name.split("_")
+            if len(parts) != 2 or parts[0] not in ("state", "config", "schedule"):
+                table[member.value] = UNSUPPORTED_OBSERVATION
+                continue
+            target, field = parts
+            if target == "schedule":
+                hook = cls._async_schedule_updated
+            else:
+                hook = hooks.get((target, field))
+            table[member.value] = (target, field, hook)
+
+        cls._observation_tables[streamdata] = table
+        return table
+
     async def async_update_observation(self, data_type, data_id, value):
         """Update observation."""
-
-        try:
-            name = self.streamdata(data_id).name
-        except ValueError:
+        target, field, hook = self.observations.setdefault(
+            data_id, UNSUPPORTED_OBSERVATION
+        )
+        if target is None:
             # Unsupported data
             _LOGGER.debug(
                 "Unsupported data id %s %s %s", self.product.id, data_id, value
@@ -418,79 +1404,97 @@ class ProductData:
             return False
 
         _LOGGER.debug(
-            "Observation update %s %s %s %s %s",
+            "Observation update %s %s %s_%s %s %s",
             self.product.id,
             data_id,
-            name,
+            target,
+            field,
             value,
             data_type,
         )
-        if "_" in name:
-            try:
-                first, second = name.split("_")
-            except Exception as ex:  # pylint: disable=broad-except
-                _LOGGER.debug("Exception %s when splitting %s", ex, name)
+        if target == "state":
+            if self.state is None:
                 return False
-
-            if first == "state":
-                if self.state is None:
-                    return False
-                self.set_state(second, value)
-                if second == "lifetimeEnergy":
-                    await self.async_cost_refresh()
-                return True
-            elif first == "config":
-                if self.config is None:
-                    return False
-                self.set_config(second, value)
-                if second == "surplusCharging":
-                    jsondata = json.loads(value)
-                    self.set_config("surplusChargingMode", jsondata["mode"])
-                    self.set_config(
-                        "surplusChargingCurrent", jsondata["standbycurrent"]
-                    )
-                return True
-            elif first == "schedule":
-                _LOGGER.debug("Schedule update")
-                if value == "":
-                    value = "{}"
-                await self.async_schedules_interpret(json.loads(value))
-                return True
-            else:
-                _LOGGER.debug("Unknown update type: %s", first)
-
-        return False
+            self.set_state(field, value)
+        elif target == "config":
+            if self.config is None:
+                return False
+            self.set_config(field, value)
+
+        if hook is not None:
+            await hook(self, value)
+        return True
+
+    async def _async_lifetime_energy_updated(self, value):
+        """Update costs locally and have them reconciled with the cloud."""
+        self.update_local_cost()
+        await self.async_cost_refresh()
+
+    async def _async_surplus_charging_updated(self, value):
+        """Split the surplus charging settings into separate config values."""
+        jsondata = json.loads(value)
+        self.set_config("surplusChargingMode", jsondata["mode"])
+        self.set_config("surplusChargingCurrent", jsondata["standbycurrent"])
+
+    async def _async_schedule_updated(self, value):
+        """Interpret a new charging schedule."""
+        _LOGGER.debug("Schedule update")
+        if value == "":
+            value = "{}"
+        await self.async_schedules_interpret(json.loads(value))
 
     def set_state(self, index, value, notify=True):
         """Update state and notify."""
         self.state[index] = value
-        if notify:
+        self.invalidate_attributes(index, self.observers["state"])
+        if notify and self.has_changed("state", index, value):
             self.notify(index, self.observers["state"])
 
     def set_config(self, index, value, notify=True):
         """Update config and notify."""
         self.config[index] = value
-        if notify:
+        self.invalidate_attributes(index, self.observers["config"])
+        if notify and self.has_changed("config", index, value):
             self.notify(index, self.observers["config"])
 
     def set_schedule(self, index, value, notify=True):
         """Update schedule and notify."""
         self.schedule[index] = value
+        self.invalidate_attributes(index, self.observers["schedule"])
         if notify:
             self.notify(index, self.observers["schedule"])
 
     def set_weekly_schedule(self, index, value, notify=True):
         """Update weekly_schedule data and notify."""
         self.weekly_schedule[index] = value
+        self.invalidate_attributes(index, self.observers["weekly_schedule"])
         if notify:
             self.notify(index, self.observers["weekly_schedule"])
 
+    def invalidate_attributes(self, index, observers):
+        """Invalidate cached attributes of entities observing a field."""
+        for observer in observers.get(index, ()):
+            observer.invalidate_attributes(index)
+
+    def invalidate_all_attributes(self, name):
+        """Invalidate cached attributes of all entities observing a data group."""
+        for observers in self.observers.get(name, {}).values():
+            for observer in observers:
+                observer.invalidate_attributes()
+
     def notify(self, index, observers):
         """Notify any listeners that data has changed."""
         if index in observers:
             for observer in observers[index]:
                 if observer.enabled:
-                    observer.async_schedule_update_ha_state(True)
+                    self.request_update(observer)
+
+    def request_update(self, observer):
+        """Request an update of an entity."""
+        if self.update_coalescer is not None:
+            self.update_coalescer.async_request_update(observer)
+        elif observer.hass is not None:
+            observer.async_push_update()
 
     def check_enabled(self, index, observers):
         """Check if there are any enabled entities for a specific data."""
@@ -504,8 +1508,17 @@ class ProductData:
         """Notify any site listeners that data has changed."""
         for index in self.observers["site"]:
             for observer in self.observers["site"][index]:
+                observer.invalidate_attributes()
                 if observer.enabled:
-                    observer.async_schedule_update_ha_state(True)
+                    self.request_update(observer)
+
+    def circuit_notify(self):
+        """Notify any circuit listeners that data has changed."""
+        for observers in self.observers.get("circuit", {}).values():
+            for observer in observers:
+                observer.invalidate_attributes()
+                if observer.enabled:
+                    self.request_update(observer)
 
 
 class Controller:
@@ -528,11 +1541,13 @@ class Controller:
         self.easee: Easee | None = None
         self.sites: list[Site] = []
         self.costs_data: list[CostData] = []
+        self.cost_scheduler = CostScheduler()
         self.circuits: list[Circuit] = []
         self.chargers: list[Charger] = []
         self.chargers_data: list[ProductData] = []
         self.equalizers: list[Equalizer] = []
         self.equalizers_data: list[ProductData] = []
+        self.products_data: dict[str, ProductData] = {}
         self.binary_sensor_entities = []
         self.button_entities = []
         self.light_entities = []
@@ -541,7 +1556,22 @@ class Controller:
         self.equalizer_sensor_entities = []
         self.equalizer_binary_sensor_entities = []
         self.equalizer_switch_entities = []
+        self.add_entities_callbacks = {}
         self.diagnostics = {}
+        self.update_coalescer = UpdateCoalescer(hass)
+        self.poll_semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self.polls_running = set()
+        self.poll_statistics = {}
+        self.api_budget = ApiBudget()
+        self.reconcile_products = False
+        self.snapshot_stale = False
+        self.startup_statistics = {}
+        self.stream_statistics = {}
+        self.stream_connected = False
+        self.stream_lost_at = None
+        self.stream_capture = None
+        self.store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
+        self.statistics_importer = StatisticsImporter(hass, self, config_entry.entry_id)
         self.monitored_sites = None
         self._init_count = 0
 
@@ -572,26 +1602,31 @@ class Controller:
             self.hass.data[DOMAIN].pop("sites_to_remove")
 
         self._call_on_remove_callbacks()
+        self.update_coalescer.async_cancel()
 
         if self.easee is not None:
-            for equalizer in self.equalizers:
-                await self.easee.sr_unsubscribe(equalizer)
-            for charger in self.chargers:
-                await self.easee.sr_unsubscribe(charger)
-            for cost_data in self.costs_data:
-                await cost_data.async_cleanup()
+            # Closing the client ends the stream and all its subscriptions,
+            # unsubscribing each product would reconnect the stream per call
+            await self.cost_scheduler.async_cleanup()
             await self.easee.close()
 
+        if self.products_data:
+            await self.async_save_snapshot()
+
+        self.products_data.clear()
+
         self.hass.data[DOMAIN].pop("controller")
         collect()
 
     async def async_initialize(self):
         """Initialize the session and get initial data."""
+        start = time.monotonic()
         client_session = aiohttp_client.async_get_clientsession(self.hass)
         ssl = get_default_context()
         self.easee = Easee(
             self.username, self.password, client_session, f"easee_hass_{VERSION}", ssl
         )
+        self.api_budget.install(self.easee)
 
         try:
             async with asyncio.timeout(TIMEOUT):
@@ -618,20 +1653,32 @@ class Controller:
             _LOGGER.exception("Unexpected error creating device: %s", err)
             return None
 
+        snapshot = await self.async_load_snapshot()
+
         try:
-            self.sites: list[Site] = await self.easee.get_account_products()
+            if snapshot is not None:
+                self.sites: list[Site] = [
+                    Site(site_data, self.easee) for site_data in snapshot["sites"]
+                ]
+            else:
+                self.sites: list[Site] = await self.easee.get_account_products()
             self.diagnostics["sites"] = self.sites
 
             self.monitored_sites = self.entry.options.get(
                 CONF_MONITORED_SITES, [site.name for site in self.sites]
             )
 
+            self.cost_scheduler.start()
             for site in self.sites:
                 if site.name not in self.monitored_sites:
                     _LOGGER.debug("Found site (unmonitored): %s %s", site.id, site.name)
                 else:
                     _LOGGER.debug("Found site (monitored): %s %s", site.id, site.name)
-                    cost_data = CostData(site, period=60)
+                    cost_data = CostData(site, self.cost_scheduler)
+                    if snapshot is not None and str(site.id) in snapshot.get(
+                        "costs", {}
+                    ):
+                        cost_data.restore_snapshot(snapshot["costs"][str(site.id)])
                     self.costs_data.append(cost_data)
                     equalizers = site.get_equalizers()
                     if equalizers is None:
@@ -647,8 +1694,11 @@ class Controller:
                                 site,
                                 EqualizerStreamData,
                                 equalizerObservations,
+                                update_coalescer=self.update_coalescer,
+                                device_info=equalizer_device_info(equalizer),
                             )
                             self.equalizers_data.append(equalizer_data)
+                            self.products_data[equalizer.id] = equalizer_data
                     circuits = site.get_circuits()
                     for circuit in circuits:
                         _LOGGER.debug(
@@ -684,8 +1734,22 @@ class Controller:
                                         circuit,
                                         master=master,
                                         cost_data=cost_data,
+                                        update_coalescer=self.update_coalescer,
+                                        device_info=charger_device_info(charger, site),
                                     )
                                     self.chargers_data.append(charger_data)
+                                    self.products_data[charger.id] = charger_data
+
+            if snapshot is not None:
+                saved = dt_util.parse_date(snapshot.get("saved", ""))
+                for product_id, product_snapshot in snapshot["products"].items():
+                    if (
+                        product_snapshot is not None
+                        and product_id in self.products_data
+                    ):
+                        await self.products_data[product_id].async_restore_snapshot(
+                            product_snapshot, saved
+                        )
 
             self.hass.data[DOMAIN]["diagnostics"] = self.diagnostics
             self._init_count = 0
@@ -696,17 +1760,99 @@ class Controller:
             _LOGGER.debug("Easee server failure %s", err)
             raise ConfigEntryNotReady from err
 
+        # Products restored from snapshot are compared with the cloud at startup
+        self.reconcile_products = snapshot is not None
+        self.startup_statistics["initialize"] = round(time.monotonic() - start, 3)
+
+    async def async_load_snapshot(self):
+        """Load the snapshot saved by the previous run."""
+        try:
+            snapshot = await self.store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to load Easee snapshot: %s", err)
+            return None
+        if not snapshot or not snapshot.get("sites"):
+            return None
+        _LOGGER.debug("Starting from snapshot saved %s", snapshot.get("saved"))
+        return snapshot
+
+    def get_snapshot(self):
+        """Get the data to persist for a warm start."""
+        return {
+            "saved": dt_util.now().date().isoformat(),
+            "sites": [site.get_data() for site in self.sites],
+            "costs": {
+                str(cost_data.site.id): cost_data.get_snapshot()
+                for cost_data in self.costs_data
+            },
+            "products": {
+                product_id: product_data.get_snapshot()
+                for product_id, product_data in self.products_data.items()
+            },
+        }
+
+    async def async_save_snapshot(self, now=None):
+        """Save a snapshot of sites and product data."""
+        if self.snapshot_stale:
+            return
+        try:
+            await self.store.async_save(self.get_snapshot())
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to save Easee snapshot: %s", err)
+
+    async def async_reconcile_products(self):
+        """Compare the products from the snapshot with the cloud."""
+        try:
+            sites = await self.easee.get_account_products()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to fetch Easee products: %s", err)
+            return
+
+        if get_topology(sites) != get_topology(self.sites):
+            _LOGGER.info("Easee products changed since last start, reloading")
+            # The snapshot holds the old products, drop it so that the
+            # reload starts from the cloud and does not reload again
+            self.snapshot_stale = True
+            try:
+                await self.store.async_remove()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Failed to remove Easee snapshot: %s", err)
+            self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+            return
+
+        new_sites = {site.id: site for site in sites}
+        new_circuits = {}
+        new_chargers = {}
+        for site in self.sites:
+            new_site = new_sites[site.id]
+            for circuit in new_site.get_circuits():
+                new_circuits[circuit.id] = circuit
+                for charger in circuit.get_chargers():
+                    new_chargers[charger.id] = charger
+            update_data(site, new_site, ("circuits", "equalizers"))
+        for circuit in self.circuits:
+            update_data(circuit, new_circuits[circuit.id], ("chargers",))
+        for charger in self.chargers:
+            update_data(charger, new_chargers[charger.id])
+
+        for charger_data in self.chargers_data:
+            charger_data.site_notify()
+            charger_data.circuit_notify()
+        await self.async_save_snapshot()
+
     async def async_stream_callback(self, idx, data_type, data_id, value):
         """Handle the he stream callback."""
-        all_data = self.chargers_data + self.equalizers_data
+        if self.stream_capture is not None:
+            self.stream_capture.record(idx, data_type, data_id, value)
+        data = self.products_data.get(idx)
+        if data is not None:
+            await data.async_update_stream_data(data_type, data_id, value)
 
-        for data in all_data:
-            if data.product.id == idx:
-                await data.async_update_stream_data(data_type, data_id, value)
-
-    async def async_setup_done(self, name):
+    async def async_setup_done(self, name, async_add_entities=None):
         """Entities setup is done."""
         _LOGGER.debug("Entities %s setup done", name)
+        # Kept to add entities that are enabled later on
+        self.add_entities_callbacks[name] = async_add_entities
         self._init_count = self._init_count + 1
 
         if self._init_count >= len(PLATFORMS):
@@ -714,60 +1860,39 @@ class Controller:
 
     async def async_add_schedulers(self):
         """Add schedules to update data."""
-        # first update
-        try:
-            await self.async_refresh_sites_state()
-        except Exception as err:
-            _LOGGER.error("Failed during call to async_refresh_sites_state: %s", err)
-        try:
-            await self.async_refresh_equalizers_state()
-        except Exception as err:
-            _LOGGER.error("Failed during call to async_refresh_equalizers_state: %s", err)
-        try:
-            await asyncio.gather(
-                *[charger.async_cost_refresh() for charger in self.chargers_data]
-            )
-        except Exception as err:
-            _LOGGER.error("Failed during call to async_cost_refresh: %s", err)
-        try:
-            await asyncio.gather(
-                *[charger.async_firmware_refresh() for charger in self.chargers_data]
-            )
-        except Exception as err:
-            _LOGGER.error("Failed during call to charger async_firmware_refresh: %s", err)
-        try:
-            await asyncio.gather(
-                *[equalizer.async_firmware_refresh() for equalizer in self.equalizers_data]
-            )
-        except Exception as err:
-            _LOGGER.error("Failed during call to equalizer async_firmware_refresh: %s", err)
-        try:
-            await asyncio.gather(
-                *[charger.async_operator_refresh() for charger in self.chargers_data]
+        # Add interval save of snapshot for warm start
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self.async_save_snapshot,
+                timedelta(seconds=SNAPSHOT_SAVE_INTERVAL_SECONDS),
             )
-        except Exception as err:
-            _LOGGER.error("Failed during call to charger async_operator_refresh: %s", err)
-        try:
-            for charger in self.chargers_data:
-                charger.site_notify()
-        except Exception as err:
-            _LOGGER.error("Failed during call to charger site_notify: %s", err)
+        )
 
-        # Add interval refresh for site state interval
+        # Add interval refresh for site state, each charger decides
+        # on its own poll interval
         self.async_on_remove(
             async_track_time_interval(
                 self.hass,
                 self.async_refresh_sites_state,
-                timedelta(seconds=SCAN_INTERVAL_STATE_SECONDS),
+                timedelta(seconds=SCAN_TICK_SECONDS),
             )
         )
 
-        # Add interval refresh for equalizer state interval
+        # Add interval refresh for equalizer state
         self.async_on_remove(
             async_track_time_interval(
                 self.hass,
                 self.async_refresh_equalizers_state,
-                timedelta(seconds=SCAN_INTERVAL_EQUALIZERS_SECONDS),
+                timedelta(seconds=SCAN_TICK_SECONDS),
+            )
+        )
+
+        # Recompute polled observations when entities are enabled or disabled
+        self.async_on_remove(
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                self.async_entity_registry_updated,
             )
         )
 
@@ -782,11 +1907,168 @@ class Controller:
             )
         )
 
-        # Subscribe to updates from signalr stream
-        for equalizer in self.equalizers:
-            await self.easee.sr_subscribe(equalizer, self.async_stream_callback)
-        for charger in self.chargers:
-            await self.easee.sr_subscribe(charger, self.async_stream_callback)
+        # Fetch data from the cloud without holding up Home Assistant startup
+        self.entry.async_create_background_task(
+            self.hass, self.async_run_startup_stages(), "easee_hass startup"
+        )
+
+    async def async_run_startup_stages(self):
+        """Run the network part of startup, most important data first."""
+        stages = [
+            ("state", self.async_startup_state),
+            ("stream", self.async_subscribe_products),
+        ]
+        if self.reconcile_products:
+            stages.append(("products", self.async_reconcile_products))
+        stages.extend(
+            [
+                ("cost", self.async_startup_cost),
+                ("firmware", self.async_startup_firmware),
+                ("operator", self.async_startup_operator),
+                ("statistics", self.async_startup_statistics),
+            ]
+        )
+
+        for name, stage in stages:
+            start = time.monotonic()
+            try:
+                await stage()
+            except Exception as err:
+                _LOGGER.error("Failed during startup stage %s: %s", name, err)
+            self.startup_statistics[name] = round(time.monotonic() - start, 3)
+            _LOGGER.debug(
+                "Startup stage %s done in %.3fs", name, self.startup_statistics[name]
+            )
+
+        try:
+            for charger in self.chargers_data:
+                charger.site_notify()
+        except Exception as err:
+            _LOGGER.error("Failed during call to charger site_notify: %s", err)
+
+        self.release_disabled_entities()
+        await self.async_save_snapshot()
+
+    async def async_startup_state(self):
+        """Get the first state of chargers and equalizers."""
+        await self.async_refresh_sites_state()
+        await self.async_refresh_equalizers_state()
+
+    async def async_subscribe_products(self):
+        """Subscribe to updates from signalr stream."""
+        await self.async_sr_call(
+            "subscribe",
+            partial(self.easee.sr_subscribe, callback=self.async_stream_callback),
+            [*self.equalizers, *self.chargers],
+        )
+
+    def start_stream_capture(self, size=STREAM_CAPTURE_SIZE):
+        """Start recording stream callbacks."""
+        _LOGGER.info("Stream capture started, keeping the last %d events", size)
+        self.stream_capture = StreamCapture(size)
+
+    async def async_stop_stream_capture(self):
+        """Stop recording stream callbacks and save them to a file."""
+        capture, self.stream_capture = self.stream_capture, None
+        if capture is None:
+            return None
+        path = self.hass.config.path(STREAM_CAPTURE_FILE)
+        await self.hass.async_add_executor_job(capture.dump, path)
+        _LOGGER.info(
+            "Stream capture of %d events saved to %s", len(capture.events), path
+        )
+        return path
+
+    async def async_sr_call(self, name, func, products):
+        """Subscribe or unsubscribe products in parallel."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUBSCRIPTIONS)
+
+        async def call(product):
+            async with semaphore:
+                try:
+                    await func(product)
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.warning("Failed to %s %s: %s", name, product.id, err)
+
+        start = time.monotonic()
+        await asyncio.gather(*[call(product) for product in products])
+        duration = round(time.monotonic() - start, 3)
+        self.stream_statistics[name] = {"products": len(products), "duration": duration}
+        _LOGGER.debug("%s of %d products took %.3fs", name, len(products), duration)
+
+    async def async_startup_cost(self):
+        """Get the first cost of chargers."""
+        await asyncio.gather(
+            *[charger.async_cost_refresh() for charger in self.chargers_data]
+        )
+
+    async def async_startup_firmware(self):
+        """Get the firmware of chargers and equalizers."""
+        await asyncio.gather(
+            *[charger.async_firmware_refresh() for charger in self.chargers_data],
+            *[equalizer.async_firmware_refresh() for equalizer in self.equalizers_data],
+        )
+
+    async def async_startup_operator(self):
+        """Get the operator of chargers."""
+        await asyncio.gather(
+            *[charger.async_operator_refresh() for charger in self.chargers_data]
+        )
+
+    async def async_startup_statistics(self):
+        """Continue importing history into long-term statistics."""
+        if "recorder" in self.hass.config.components:
+            await self.statistics_importer.async_start(self.entry)
+
+    async def async_import_statistics(self, start=None):
+        """Import history into long-term statistics from a start date."""
+        await self.statistics_importer.async_start(self.entry, start)
+
+    @callback
+    def async_entity_registry_updated(self, event):
+        """Handle entities being enabled or disabled."""
+        if "disabled_by" not in event.data.get("changes", {}):
+            return
+        for product_data in self.products_data.values():
+            product_data.invalidate_poll_observations()
+
+        entry = er.async_get(self.hass).async_get(event.data["entity_id"])
+        if entry is not None and entry.platform == DOMAIN and not entry.disabled:
+            self.async_create_enabled_entity(entry)
+
+    @callback
+    def async_create_enabled_entity(self, entry):
+        """Create an entity that was skipped at setup because it was disabled."""
+        add_entities = self.add_entities_callbacks.get(entry.domain)
+        if add_entities is None:
+            return
+        if any(
+            entity.unique_id == entry.unique_id
+            for entity in self.get_platform_entities(entry.domain)
+        ):
+            return
+
+        product_id, _, key = entry.unique_id.partition("_")
+        product_data = self.products_data.get(product_id)
+        if product_data is None:
+            return
+        if product_data in self.equalizers_data:
+            descriptions = EQUALIZER_ENTITY_DESCRIPTIONS
+        else:
+            descriptions = CHARGER_ENTITY_DESCRIPTIONS
+        for description in descriptions:
+            if (
+                description.key == key
+                and ENTITY_PLATFORMS[description.entity_type] == entry.domain
+            ):
+                break
+        else:
+            return
+        if description.only_master and not product_data.is_master():
+            return
+
+        _LOGGER.debug("Creating enabled entity %s", entry.entity_id)
+        add_entities([self._create_entity(product_data, description)])
 
     async def async_delayed_refresh_operator(self, now=None):
         """Refresh operator for chargers."""
@@ -810,25 +2092,106 @@ class Controller:
 
     async def async_refresh_sites_state(self, now=None):
         """Get site state for all sites and updates the chargers state and config."""
-        for charger_data in self.chargers_data:
-            charger_data.set_signalr_state(self.easee.sr_is_connected())
-            charger_data.check_latest_pulse()
-            if charger_data.is_state_polled() and self.easee.sr_is_connected():
-                continue
-
-            await charger_data.async_refresh()
-            charger_data.set_signalr_state(self.easee.sr_is_connected())
+        await self.async_poll_products(
+            "chargers", self.chargers_data, SCAN_INTERVAL_STATE_SECONDS
+        )
 
     async def async_refresh_equalizers_state(self, now=None):
         """Get equalizer state for all equalizers."""
-        for equalizer_data in self.equalizers_data:
-            equalizer_data.set_signalr_state(self.easee.sr_is_connected())
-            equalizer_data.check_latest_pulse()
-            if equalizer_data.is_state_polled() and self.easee.sr_is_connected():
-                continue
+        await self.async_poll_products(
+            "equalizers", self.equalizers_data, SCAN_INTERVAL_EQUALIZERS_SECONDS
+        )
+
+    async def async_poll_products(self, name, products_data, interval):
+        """Poll the products that are due for polling, in parallel."""
+        stats = self.poll_statistics.setdefault(
+            name,
+            {
+                "cycles": 0,
+                "skipped_cycles": 0,
+                "polled": 0,
+                "backfilled": 0,
+                "last_duration": None,
+            },
+        )
+        if name in self.polls_running:
+            _LOGGER.debug("Previous %s poll cycle still running, skipping", name)
+            stats["skipped_cycles"] += 1
+            return
+        self.polls_running.add(name)
+        start = time.monotonic()
+        try:
+            connected = self.easee.sr_is_connected()
+            self.check_stream_gap(connected)
+            to_poll = []
+            for product_data in products_data:
+                product_data.set_signalr_state(connected)
+                product_data.check_latest_pulse()
+                if product_data.is_poll_due(connected, interval):
+                    to_poll.append(product_data)
+                elif product_data.is_backfill_due():
+                    to_poll.append(product_data)
+                    stats["backfilled"] += 1
+
+            results = await asyncio.gather(
+                *[self.async_poll_product(product_data) for product_data in to_poll]
+            )
+            stats["polled"] += sum(results)
+        finally:
+            self.polls_running.discard(name)
+            stats["cycles"] += 1
+            stats["last_duration"] = round(time.monotonic() - start, 3)
+            _LOGGER.debug("Poll cycle %s took %s s", name, stats["last_duration"])
+
+    async def async_poll_product(self, product_data):
+        """Poll a single product, respecting rate limiting."""
+        async with self.poll_semaphore:
+            # Skip rather than queue up polls while the budget is used up,
+            # they are retried on a later tick
+            url = f"/state/{product_data.product.id}/observations"
+            if self.api_budget.get_delay(API_PRIORITY_STATE, "GET", url) > 0:
+                return False
+            try:
+                await product_data.async_refresh()
+            except TooManyRequestsException:
+                # Handled by the API budget
+                return False
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Failed to refresh %s: %s", product_data.product.id, err)
+                # Count the attempt as a poll, so a failing product is retried
+                # at its poll interval instead of on every tick
+                product_data.last_poll = time.monotonic()
+                if product_data.backfill_due is not None:
+                    product_data.backfill_due = (
+                        product_data.last_poll + STREAM_GAP_GRACE_SECONDS
+                    )
+                return False
 
-            await equalizer_data.async_refresh()
-            equalizer_data.set_signalr_state(self.easee.sr_is_connected())
+            product_data.last_poll = time.monotonic()
+            product_data.backfill_due = None
+            product_data.set_signalr_state(self.easee.sr_is_connected())
+            return True
+
+    def check_stream_gap(self, connected):
+        """Mark all products for backfill when the stream reconnects."""
+        if not connected:
+            if self.stream_connected:
+                self.stream_connected = False
+                self.stream_lost_at = time.monotonic()
+            return
+        if self.stream_connected:
+            return
+        self.stream_connected = True
+        if self.stream_lost_at is None:
+            # First connection after startup
+            return
+
+        now = time.monotonic()
+        _LOGGER.debug("Stream reconnected after %.0fs", now - self.stream_lost_at)
+        self.stream_lost_at = None
+        self.stream_statistics["gaps"] = self.stream_statistics.get("gaps", 0) + 1
+        for product_data in self.products_data.values():
+            product_data.mark_stream_gap(now)
 
     async def async_force_site_notify(self, site_id):
         """Send an update request to all entities watching site data."""
@@ -836,6 +2199,23 @@ class Controller:
             if charger_data.site.id == site_id:
                 charger_data.site_notify()
 
+    def get_statistics(self):
+        """Get runtime statistics."""
+        products_data = self.products_data.values()
+        return {
+            "entity_updates": self.update_coalescer.get_statistics(),
+            "observation_updates": {
+                "delivered": sum(data.updates_delivered for data in products_data),
+                "suppressed": sum(data.updates_suppressed for data in products_data),
+            },
+            "polling": self.poll_statistics,
+            "api": self.api_budget.get_statistics(),
+            "cost": self.cost_scheduler.get_statistics(),
+            "statistics_import": self.statistics_importer.get_statistics(),
+            "startup": self.startup_statistics,
+            "stream": self.stream_statistics,
+        }
+
     def get_sites(self):
         """Get sites."""
         return self.sites
@@ -972,37 +2352,54 @@ class Controller:
         """Return switch_entities."""
         return self.switch_entities + self.equalizer_switch_entities
 
-    def _create_entity(
-        self,
-        object_type,
-        product_data,
-        name,
-        data,
-    ):
-        entity_type_name = ENTITY_TYPES[object_type]
-
-        entity = entity_type_name(
-            data=product_data,
-            name=name,
-            state_key=data["key"],
-            units=data["units"],
-            convert_units_func=convert_units_funcs.get(data["convert_units_func"]),
-            attrs_keys=data["attrs"],
-            device_class=data["device_class"],
-            translation_key=data.get("translation_key"),
-            suggested_display_precision=data.get("suggested_display_precision"),
-            state_class=data.get("state_class"),
-            state_func=data.get("state_func"),
-            switch_func=data.get("switch_func"),
-            enabled_default=data.get("enabled_default", True),
-            entity_category=data.get("entity_category"),
-        )
+    def get_platform_entities(self, platform):
+        """Get the entities of a platform."""
+        return {
+            "sensor": self.get_sensor_entities,
+            "binary_sensor": self.get_binary_sensor_entities,
+            "button": self.get_button_entities,
+            "light": self.get_light_entities,
+            "switch": self.get_switch_entities,
+        }[platform]()
+
+    def remove_entity(self, entity):
+        """Forget an entity and stop sending it updates."""
+        for entities in (
+            self.sensor_entities,
+            self.binary_sensor_entities,
+            self.switch_entities,
+            self.button_entities,
+            self.light_entities,
+            self.equalizer_sensor_entities,
+            self.equalizer_binary_sensor_entities,
+            self.equalizer_switch_entities,
+        ):
+            if entity in entities:
+                entities.remove(entity)
+        entity.data.unregister_for_update(entity)
+
+    def release_disabled_entities(self):
+        """Forget entities registered as disabled when they were added.
+
+        Entities not yet in the entity registry are created so that Home
+        Assistant registers them, those disabled by default are never added
+        to hass and are released here.
+        """
+        for platform in set(ENTITY_PLATFORMS.values()):
+            # Some platforms return their live list, which remove_entity changes
+            for entity in list(self.get_platform_entities(platform)):
+                if entity.registry_entry is not None and entity.registry_entry.disabled:
+                    self.remove_entity(entity)
+
+    def _create_entity(self, product_data, description):
+        object_type = description.entity_type
+        entity = ENTITY_TYPES[object_type](product_data, description)
         _LOGGER.debug(
             "Adding entity: %s (%s) for product %s, unit %s",
-            name,
+            description.key,
             object_type,
             product_data.product.name,
-            data["units"],
+            description.units,
         )
         if object_type == "sensor":
             self.sensor_entities.append(entity)
@@ -1039,29 +2436,29 @@ class Controller:
         self.equalizer_binary_sensor_entities = []
         self.equalizer_switch_entities = []
 
-        all_easee_entities = {**MANDATORY_EASEE_ENTITIES, **OPTIONAL_EASEE_ENTITIES}
+        # Entities disabled in the entity registry are not created, they
+        # are created when enabled
+        registry = er.async_get(self.hass)
+
+        def is_disabled(product_data, description):
+            entity_id = registry.async_get_entity_id(
+                ENTITY_PLATFORMS[description.entity_type],
+                DOMAIN,
+                f"{product_data.product.id}_{description.key}",
+            )
+            return entity_id is not None and registry.async_get(entity_id).disabled
 
         for charger_data in self.chargers_data:
             is_slave = not charger_data.is_master()
-            for key, data in all_easee_entities.items():
-                entity_type = data.get("type", "sensor")
-                only_master = data.get("only_master", False)
-                if is_slave and only_master:
+            for description in CHARGER_ENTITY_DESCRIPTIONS:
+                if is_slave and description.only_master:
                     continue
-                self._create_entity(
-                    entity_type,
-                    product_data=charger_data,
-                    name=key,
-                    data=data,
-                )
+                if is_disabled(charger_data, description):
+                    continue
+                self._create_entity(charger_data, description)
 
         for equalizer_data in self.equalizers_data:
-            for key, data in EASEE_EQ_ENTITIES.items():
-                entity_type = data.get("type", "eq_sensor")
-
-                self._create_entity(
-                    entity_type,
-                    product_data=equalizer_data,
-                    name=key,
-                    data=data,
-                )
+            for description in EQUALIZER_ENTITY_DESCRIPTIONS:
+                if is_disabled(equalizer_data, description):
+                    continue
+                self._create_entity(equalizer_data, description)
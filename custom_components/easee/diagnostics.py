@@ -36,6 +36,7 @@ async def async_get_config_entry_diagnostics(
         "account": async_redact_data(config_entry.data, TO_REDACT),
         "options": async_redact_data(config_entry.options, TO_REDACT),
         "sites": async_redact_data(hass.data[DOMAIN]["diagnostics"], TO_REDACT_SITES),
+        "statistics": hass.data[DOMAIN]["controller"].get_statistics(),
     }
 
     return diagnostics_data
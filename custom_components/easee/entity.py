@@ -4,10 +4,14 @@ Author: Niklas Fondberg<niklas.fondberg@gmail.com>.
 """
 
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 import logging
+from operator import attrgetter
 
 from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.entity_registry import async_entries_for_device
@@ -17,6 +21,8 @@ from .const import (
     DOMAIN,
     EASEE_PRODUCT_CODES,
     EASEE_STATUS,
+    MANUFACTURER,
+    MODEL_EQUALIZER,
     PHASE_MODE_STATUS,
     REASON_NO_CURRENT,
 )
@@ -86,90 +92,229 @@ convert_units_funcs = {
 }
 
 
+KEY_SOURCES = {
+    "config",
+    "state",
+    "circuit",
+    "site",
+    "cost_day",
+    "cost_month",
+    "cost_year",
+    "schedule",
+    "weekly_schedule",
+}
+OPTIONAL_KEY_SOURCES = {"schedule", "weekly_schedule"}
+STATE_FUNC_SOURCES = {"state", "config", "schedule", "weekly_schedule"}
+
+_key_accessors: dict[str, Callable] = {}
+_attr_schemas: dict[tuple, tuple] = {}
+
+
+def get_key_accessor(key) -> Callable:
+    """Get a function reading the value of a dotted key from product data."""
+    accessor = _key_accessors.get(key)
+    if accessor is None:
+        accessor = _key_accessors[key] = _compile_key(key)
+    return accessor
+
+
+def _compile_key(key) -> Callable:
+    """Compile a dotted key into an accessor function."""
+    first, _, second = key.partition(".")
+    if first not in KEY_SOURCES or not second or "." in second:
+
+        def unknown_key(data):
+            _LOGGER.error("Unknown first part of key: %s", key)
+            raise IndexError("Unknown first part of key")
+
+        return unknown_key
+
+    source = attrgetter(first)
+    optional = first in OPTIONAL_KEY_SOURCES
+
+    def accessor(data):
+        container = source(data)
+        if optional and container is None:
+            return None
+        try:
+            value = container[second]
+        except KeyError:
+            return ""
+        if isinstance(value, datetime):
+            value = dt_util.as_local(value)
+        return value
+
+    return accessor
+
+
+def get_attribute_converter(attr_key, units) -> Callable | None:
+    """Get the rounding function used for an attribute."""
+    key = attr_key.lower()
+    if "voltage" in key:
+        return round_0_dec
+    if "current" in key:
+        return round_1_dec
+    if "cumulative" in key or "power" in key:
+        return partial(round_1_dec, unit=units)
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class EaseeEntityDescription:
+    """Entity definition from const, shared by all products."""
+
+    key: str
+    entity_type: str
+    state_key: str
+    units: str | None
+    convert_units_func: Callable | None
+    attrs_keys: tuple[str, ...]
+    device_class: str | None
+    name: str | None
+    translation_key: str | None = None
+    suggested_display_precision: int | None = None
+    state_class: str | None = None
+    state_func: Callable | None = None
+    switch_func: str | None = None
+    enabled_default: bool = True
+    entity_category: str | None = None
+    deadband: float | None = None
+    only_master: bool = False
+
+
+def get_entity_descriptions(definitions, default_type) -> tuple:
+    """Convert entity definitions from const to descriptions."""
+    return tuple(
+        EaseeEntityDescription(
+            key=key,
+            entity_type=data.get("type", default_type),
+            state_key=data["key"],
+            units=data["units"],
+            convert_units_func=convert_units_funcs.get(data["convert_units_func"]),
+            attrs_keys=tuple(data["attrs"]),
+            device_class=data["device_class"],
+            name=(
+                key.capitalize().replace("_", " ")
+                if data.get("translation_key") is None
+                else None
+            ),
+            translation_key=data.get("translation_key"),
+            suggested_display_precision=data.get("suggested_display_precision"),
+            state_class=data.get("state_class"),
+            state_func=data.get("state_func"),
+            switch_func=data.get("switch_func"),
+            enabled_default=data.get("enabled_default", True),
+            entity_category=data.get("entity_category"),
+            deadband=data.get("deadband"),
+            only_master=data.get("only_master", False),
+        )
+        for key, data in definitions.items()
+    )
+
+
+def charger_device_info(charger, site) -> DeviceInfo:
+    """Get the device information of a charger."""
+    try:
+        product_code = charger.product_code
+    except AttributeError:
+        product_code = None
+
+    return DeviceInfo(
+        identifiers={(DOMAIN, charger.id)},
+        serial_number=charger.id,
+        name=charger.name,
+        manufacturer="Easee",
+        model=EASEE_PRODUCT_CODES.get(product_code, f"productCode: {product_code}"),
+        configuration_url=f"https://easee.cloud/sites/{site.id}/products/{charger.id}",
+    )
+
+
+def equalizer_device_info(equalizer) -> DeviceInfo:
+    """Get the device information of an equalizer."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, equalizer.id)},
+        serial_number=equalizer.id,
+        name=equalizer.name,
+        manufacturer=MANUFACTURER,
+        model=MODEL_EQUALIZER,
+        configuration_url=f"https://easee.cloud/mypage/products/{equalizer.id}",
+    )
+
+
+def get_attribute_schema(attrs_keys, units) -> tuple:
+    """Get the attribute readers and watched fields shared by equal entities."""
+    schema_key = (tuple(attrs_keys), units)
+    schema = _attr_schemas.get(schema_key)
+    if schema is None:
+        readers = tuple(
+            (
+                attr_key.replace(".", "_"),
+                get_key_accessor(attr_key),
+                get_attribute_converter(attr_key, units),
+            )
+            for attr_key in attrs_keys
+        )
+        fields = frozenset(attr_key.partition(".")[2] for attr_key in attrs_keys)
+        schema = _attr_schemas[schema_key] = (readers, fields)
+    return schema
+
+
 class ChargerEntity(Entity):
     """Implementation of Easee charger entity."""
 
-    def __init__(
-        self,
-        data,
-        name: str,
-        state_key: str,
-        units: str,
-        convert_units_func: Callable,
-        attrs_keys: list[str],
-        device_class: str,
-        state_func=None,
-        switch_func=None,
-        enabled_default=True,
-        state_class=None,
-        entity_category=None,
-        translation_key=None,
-        suggested_display_precision=None,
-    ):
+    def __init__(self, data, description: EaseeEntityDescription):
         """Initialize the entity."""
         self.data = data
-        self._entity_name = name
-        self._state_key = state_key
-        self._units = units
-        self._convert_units_func = convert_units_func
-        self._attrs_keys = attrs_keys
-        self._state_func = state_func
+        self.description = description
+        self._entity_name = description.key
+        self._state_key = description.state_key
+        self._units = description.units
+        self._convert_units_func = description.convert_units_func
+        self._attrs_keys = description.attrs_keys
+        self._attr_readers, self._attrs_fields = get_attribute_schema(
+            description.attrs_keys, description.units
+        )
+        self._attrs_cache = None
+        self._state_accessor = get_key_accessor(description.state_key)
+        self._state_func = description.state_func
+        self._state_func_source = None
+        if description.state_func is not None:
+            first = description.state_key.partition(".")[0]
+            if first in STATE_FUNC_SOURCES:
+                self._state_func_source = attrgetter(first)
         self._state = None
-        self._switch_func = switch_func
-        self._attr_unique_id = f"{self.data.product.id}_{self._entity_name}"
-        self._attr_device_class = device_class
-        self._attr_translation_key = translation_key
-        self._attr_suggested_display_precision = suggested_display_precision
+        self._switch_func = description.switch_func
+        self._attr_unique_id = f"{data.product.id}_{description.key}"
+        self._attr_device_class = description.device_class
+        self._attr_translation_key = description.translation_key
+        self._attr_suggested_display_precision = description.suggested_display_precision
         self._attr_should_poll = False
-        self._attr_entity_registry_enabled_default = enabled_default
-        if translation_key is None:
-            self._attr_name = f"{self._entity_name}".capitalize().replace("_", " ")
+        self._attr_entity_registry_enabled_default = description.enabled_default
+        if description.name is not None:
+            self._attr_name = description.name
         self._attr_has_entity_name = True
-        self._attr_state_class = state_class
-        self._attr_entity_category = entity_category
-        self._attr_native_unit_of_measurement = self._units
-
-        try:
-            product_code = self.data.product.product_code
-        except AttributeError:
-            product_code = None
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self.data.product.id)},
-            serial_number=self.data.product.id,
-            name=self.data.product.name,
-            manufacturer="Easee",
-            model=EASEE_PRODUCT_CODES.get(product_code, f"productCode: {product_code}"),
-            configuration_url=(
-                f"https://easee.cloud/sites/{self.data.site.id}"
-                f"/products/{self.data.product.id}"
-            ),
-        )
+        self._attr_state_class = description.state_class
+        self._attr_entity_category = description.entity_category
+        self._attr_native_unit_of_measurement = description.units
+        self._attr_device_info = data.device_info
 
         if self._state_key not in self._attrs_keys:
-            self.data.register_for_update(self._state_key, self)
+            self.data.register_for_update(self._state_key, self, description.deadband)
         for attr in self._attrs_keys:
-            self.data.register_for_update(attr, self)
+            self.data.register_for_update(attr, self, description.deadband)
+
+    async def async_added_to_hass(self) -> None:
+        """Entity added to Home Assistant."""
+        await super().async_added_to_hass()
+        self.data.invalidate_poll_observations()
+        # Data may already be available, e.g. restored from snapshot
+        self.update_state()
 
     async def async_will_remove_from_hass(self) -> None:
         """Disconnect object when removed."""
+        self.data.invalidate_poll_observations()
         controller = self.hass.data[DOMAIN]["controller"]
-        if self in controller.sensor_entities:
-            controller.sensor_entities.remove(self)
-        if self in controller.binary_sensor_entities:
-            controller.binary_sensor_entities.remove(self)
-        if self in controller.switch_entities:
-            controller.switch_entities.remove(self)
-        if self in controller.button_entities:
-            controller.button_entities.remove(self)
-        if self in controller.light_entities:
-            controller.light_entities.remove(self)
-        if self in controller.equalizer_sensor_entities:
-            controller.equalizer_sensor_entities.remove(self)
-        if self in controller.equalizer_binary_sensor_entities:
-            controller.equalizer_binary_sensor_entities.remove(self)
-        if self in controller.equalizer_switch_entities:
-            controller.equalizer_switch_entities.remove(self)
+        controller.remove_entity(self)
         ent_reg = er.async_get(self.hass)
         entity_entry = ent_reg.async_get(self.entity_id)
 
@@ -192,39 +337,42 @@ class ChargerEntity(Entity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return the extra state attributes."""
+        if self._attrs_cache is not None:
+            return self._attrs_cache
         try:
             attrs = {
                 "name": self.data.product.name,
                 "id": self.data.product.id,
             }
-            for attr_key in self._attrs_keys:
-                key = attr_key.replace(".", "_")
-                if "voltage" in key.lower():
-                    attrs[key] = round_0_dec(self.get_value_from_key(attr_key))
-                elif "current" in key.lower():
-                    attrs[key] = round_1_dec(self.get_value_from_key(attr_key))
-                elif "cumulative" in key.lower() or "power" in key.lower():
-                    attrs[key] = round_1_dec(
-                        self.get_value_from_key(attr_key), self._units
-                    )
-                else:
-                    attrs[key] = self.get_value_from_key(attr_key)
+            data = self.data
+            for key, accessor, convert in self._attr_readers:
+                value = accessor(data)
+                attrs[key] = value if convert is None else convert(value)
 
+            self._attrs_cache = attrs
             return attrs
         except TypeError:
             return {}
         except IndexError:
             return {}
 
+    def invalidate_attributes(self, index=None):
+        """Drop the cached attributes if they depend on the changed field."""
+        if index is None or index in self._attrs_fields:
+            self._attrs_cache = None
+
     def set_value_from_key(self, key, value):
         """Set value from key."""
         first, second = key.split(".")
+        self.invalidate_attributes(second)
         if first == "config":
             if self.data.config is not None:
                 self.data.config[second] = value
+                self.data.reset_change_detection(first, second)
         elif first == "state":
             if self.data.state is not None:
                 self.data.state[second] = value
+                self.data.reset_change_detection(first, second)
         elif first == "circuit":
             self.data.circuit[second] = value
         elif first == "site":
@@ -243,61 +391,32 @@ class ChargerEntity(Entity):
 
     def get_value_from_key(self, key):
         """Get value from key."""
-        try:
-            first, second = key.split(".")
-            value = None
-            if first == "config":
-                value = self.data.config[second]
-            elif first == "state":
-                value = self.data.state[second]
-            elif first == "circuit":
-                value = self.data.circuit[second]
-            elif first == "site":
-                value = self.data.site[second]
-            elif first == "cost_day":
-                value = self.data.cost_day[second]
-            elif first == "cost_month":
-                value = self.data.cost_month[second]
-            elif first == "cost_year":
-                value = self.data.cost_year[second]
-            elif first == "schedule":
-                if self.data.schedule is not None:
-                    value = self.data.schedule[second]
-            elif first == "weekly_schedule":
-                if self.data.weekly_schedule is not None:
-                    value = self.data.weekly_schedule[second]
-            else:
-                _LOGGER.error("Unknown first part of key: %s", key)
-                raise IndexError("Unknown first part of key")
-
-            if isinstance(value, datetime):
-                value = dt_util.as_local(value)
-        except KeyError:
-            value = ""
-
-        return value
+        return get_key_accessor(key)(self.data)
 
     async def async_update(self) -> None:
         """Get the latest data and update the state."""
+        self.update_state()
+
+    @callback
+    def async_push_update(self) -> None:
+        """Update the state from pushed data and write it to Home Assistant."""
+        self.update_state()
+        self.async_write_ha_state()
+
+    def update_state(self) -> None:
+        """Recompute the state from product data."""
         _LOGGER.debug(
-            "Entity async_update : %s %s",
+            "Entity update_state : %s %s",
             self.data.product.id,
             self._entity_name,
         )
         self._state = None
         try:
-            self._state = self.get_value_from_key(self._state_key)
+            self._state = self._state_accessor(self.data)
             if self._state == "":
                 self._state = None
-            if self._state_func is not None:
-                if self._state_key.startswith("state"):
-                    self._state = self._state_func(self.data.state)
-                if self._state_key.startswith("config"):
-                    self._state = self._state_func(self.data.config)
-                if self._state_key.startswith("schedule"):
-                    self._state = self._state_func(self.data.schedule)
-                if self._state_key.startswith("weekly_schedule"):
-                    self._state = self._state_func(self.data.weekly_schedule)
+            if self._state_func_source is not None:
+                self._state = self._state_func(self._state_func_source(self.data))
             if self._convert_units_func is not None:
                 self._state = self._convert_units_func(self._state, self._units)
 
@@ -22,7 +22,7 @@ async def async_setup_entry(
     controller = hass.data[DOMAIN]["controller"]
     entities = controller.get_light_entities()
     async_add_entities(entities)
-    await controller.async_setup_done("light")
+    await controller.async_setup_done("light", async_add_entities)
 
 
 class ChargerLight(ChargerEntity, LightEntity):
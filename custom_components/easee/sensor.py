@@ -9,11 +9,10 @@ import logging
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN, MANUFACTURER, MODEL_EQUALIZER
+from .const import DOMAIN
 from .entity import ChargerEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,7 +27,7 @@ async def async_setup_entry(
     controller = hass.data[DOMAIN]["controller"]
     entities = controller.get_sensor_entities()
     async_add_entities(entities)
-    await controller.async_setup_done("sensor")
+    await controller.async_setup_done("sensor", async_add_entities)
 
 
 class ChargerSensor(ChargerEntity, SensorEntity):
@@ -67,15 +66,3 @@ class EqualizerSensor(ChargerEntity, SensorEntity):
     def native_value(self) -> StateType:
         """Return native value of sensor."""
         return self._state
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device information."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.data.product.id)},
-            serial_number=self.data.product.id,
-            name=self.data.product.name,
-            manufacturer=MANUFACTURER,
-            model=MODEL_EQUALIZER,
-            configuration_url=f"https://easee.cloud/mypage/products/{self.data.product.id}",
-        )
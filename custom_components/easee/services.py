@@ -17,6 +17,7 @@ from homeassistant.helpers import (
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .statistics_importer import STATISTICS_DEFAULT_DAYS
 
 # pylint: disable=broad-except
 
@@ -51,6 +52,7 @@ ATTR_COST_CURRENCY = "currency_id"
 ATTR_COST_VAT = "vat"
 ATTR_ENABLE = "enable"
 ATTR_TTL = "time_to_live"
+ATTR_START_DATE = "start_date"
 ATTR_PHASE_MODE = "phase_mode"
 ATTR_1PHASE = "1_phase"
 ATTR_AUTOPHASE = "auto_phase"
@@ -285,6 +287,18 @@ SERVICE_SET_OPERATOR = vol.All(
     exclusive_schema2.extend(ext_operator),
 )
 
+SERVICE_STREAM_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENABLE): cv.boolean,
+    }
+)
+
+SERVICE_IMPORT_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START_DATE): cv.date,
+    }
+)
+
 SERVICE_MAP = {
     "action_command": {
         "handler": "charger_execute_action_command",
@@ -386,6 +400,14 @@ SERVICE_MAP = {
         "function_call": "set_operator",
         "schema": SERVICE_SET_OPERATOR,
     },
+    "stream_capture": {
+        "handler": "controller_stream_capture",
+        "schema": SERVICE_STREAM_CAPTURE_SCHEMA,
+    },
+    "import_statistics": {
+        "handler": "controller_import_statistics",
+        "schema": SERVICE_IMPORT_STATISTICS_SCHEMA,
+    },
 }
 
 
@@ -1133,6 +1155,26 @@ async def async_setup_services(hass):  # noqa: C901
 
         raise HomeAssistantError(f"Could not find charger: {charger.id}")
 
+    async def controller_stream_capture(call):
+        """Start or stop recording of stream data."""
+        _LOGGER.debug("execute_service: %s %s", str(call.service), str(call.data))
+
+        if call.data[ATTR_ENABLE]:
+            controller.start_stream_capture()
+        else:
+            await controller.async_stop_stream_capture()
+
+    async def controller_import_statistics(call):
+        """Import charger energy and cost history into statistics."""
+        _LOGGER.debug("execute_service: %s %s", str(call.service), str(call.data))
+
+        if "recorder" not in hass.config.components:
+            raise HomeAssistantError("The recorder is needed to import statistics")
+        start = call.data.get(ATTR_START_DATE)
+        if start is None:
+            start = dt_util.now().date() - timedelta(days=STATISTICS_DEFAULT_DAYS)
+        await controller.async_import_statistics(start)
+
     for service, data in SERVICE_MAP.items():
         handler = locals()[data["handler"]]
         hass.services.async_register(DOMAIN, service, handler, schema=data["schema"])
@@ -0,0 +1,283 @@
+"""Import of charger energy and cost history into long-term statistics."""
+
+import asyncio
+from datetime import date, timedelta
+import logging
+
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# History is fetched one month per call at most, the hourly usage endpoint
+# does not answer longer periods, and chunks are spaced out so a multi-year
+# import for many chargers is spread over time
+STATISTICS_CHUNK_DELAY_SECONDS = 10
+# Part of the per site cost quota kept for the live cost refreshes, the
+# import only fetches a cost chunk while more than this is left
+STATISTICS_COST_RESERVE = 0.5
+STATISTICS_DEFAULT_DAYS = 365
+STATISTICS_SAVE_INTERVAL = 10
+
+
+def get_next_month(day: date) -> date:
+    """Get the first day of the month after a date."""
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def get_statistic_id(product_id, name):
+    """Get the id of an external statistic of a product."""
+    return f"{DOMAIN}:{product_id.lower()}_{name}"
+
+
+def parse_hourly_usage(usage, charger_id):
+    """Get (hour start, kWh) pairs of a charger from an hourly usage answer.
+
+    The answer holds a record per charger with its measured consumptions,
+    each with the start of an hour and the energy used in it. Anything else
+    raises ValueError, so that the chunk is retried instead of skipped.
+    """
+    try:
+        record = next(record for record in usage if record["chargerId"] == charger_id)
+        values = []
+        for consumption in record["measuredConsumptions"]:
+            start = dt_util.parse_datetime(consumption["date"])
+            if start is None:
+                raise ValueError(f"invalid date {consumption['date']}")
+            values.append(
+                (
+                    dt_util.as_utc(start).replace(minute=0, second=0, microsecond=0),
+                    float(consumption["consumption"]),
+                )
+            )
+    except StopIteration:
+        raise ValueError("no record of the charger") from None
+    except (KeyError, TypeError) as err:
+        raise ValueError(f"malformed record: {err!r}") from err
+    return values
+
+
+class StatisticsImporter:
+    """Backfill of charger energy and cost into long-term statistics.
+
+    The history from a start date up to today is split into chunks of at
+    most one month per charger for energy and per site for cost. Each chunk
+    is one cloud call and one bulk write of external statistics. Progress
+    is saved after every chunk, so an import continues where it stopped
+    after a restart, and later runs only add the days since the last one.
+    """
+
+    def __init__(self, hass: HomeAssistant, controller, entry_id: str):
+        """Initialize the importer."""
+        self.hass = hass
+        self.controller = controller
+        self.store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics")
+        self.progress = None
+        self.task = None
+        self.chunks = 0
+
+    async def async_load(self):
+        """Load the progress of an earlier import."""
+        if self.progress is None:
+            self.progress = await self.store.async_load() or {}
+        return self.progress
+
+    def is_running(self):
+        """Check if an import is running."""
+        return self.task is not None and not self.task.done()
+
+    async def async_start(self, entry, start: date | None = None):
+        """Start an import, from start if given or where the last one stopped.
+
+        An earlier start than the one of the last import restarts the
+        import, since statistics sums are built from the first value on.
+        """
+        progress = await self.async_load()
+        if start is not None:
+            if progress.get("start") is None or start.isoformat() < progress["start"]:
+                # The running import would go on with its sums in the reset
+                # progress, so it is stopped before the restart
+                await self.async_cancel()
+                progress.clear()
+                progress["start"] = start.isoformat()
+                progress["series"] = {}
+        if progress.get("start") is None or self.is_running():
+            return
+        self.task = entry.async_create_background_task(
+            self.hass, self.async_run(), "easee_hass statistics import"
+        )
+
+    async def async_cancel(self):
+        """Stop a running import, its progress is saved."""
+        if not self.is_running():
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            _LOGGER.debug("Statistics import cancelled")
+        self.task = None
+
+    async def async_run(self):
+        """Import chunks until all series are up to date."""
+        today = dt_util.now().date()
+        start = date.fromisoformat(self.progress["start"])
+        series = self.progress.setdefault("series", {})
+        _LOGGER.debug("Statistics import from %s", start)
+
+        jobs = [
+            (f"energy {charger.id}", charger, self.async_import_energy)
+            for charger in self.controller.get_chargers()
+        ]
+        jobs.extend(
+            (f"cost {cost_data.site.id}", cost_data, self.async_import_cost)
+            for cost_data in self.controller.costs_data
+        )
+
+        done = 0
+        try:
+            for key, product, import_chunk in jobs:
+                state = series.setdefault(key, {"next": start.isoformat()})
+                while (chunk_start := date.fromisoformat(state["next"])) < today:
+                    chunk_end = min(get_next_month(chunk_start), today)
+                    if not await import_chunk(product, state, chunk_start, chunk_end):
+                        break
+                    state["next"] = chunk_end.isoformat()
+                    self.chunks += 1
+                    done += 1
+                    if done % STATISTICS_SAVE_INTERVAL == 0:
+                        await self.store.async_save(self.progress)
+                    await asyncio.sleep(STATISTICS_CHUNK_DELAY_SECONDS)
+        finally:
+            await self.store.async_save(self.progress)
+            _LOGGER.debug("Statistics import stopped after %d chunks", done)
+
+    async def async_import_energy(self, charger, state, start, end):
+        """Import the hourly energy of a charger for one chunk."""
+        begin = dt_util.start_of_local_day(start)
+        finish = dt_util.start_of_local_day(end)
+        try:
+            usage = await charger.get_hourly_consumption_between_dates(
+                dt_util.as_utc(begin), dt_util.as_utc(finish)
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Failed to get energy history of %s from %s: %s", charger.id, start, err
+            )
+            return False
+        if usage is None:
+            return False
+
+        try:
+            values = parse_hourly_usage(usage, charger.id)
+        except ValueError as err:
+            _LOGGER.warning(
+                "Invalid energy history of %s from %s: %s", charger.id, start, err
+            )
+            return False
+        if not values:
+            # Not taken as a period without usage, the cloud may not have the
+            # history of the period (yet)
+            _LOGGER.warning(
+                "No energy history of %s from %s, retrying on the next import;"
+                " use a later start date if the charger was installed later",
+                charger.id,
+                start,
+            )
+            return False
+
+        total = state.get("sum", 0.0)
+        statistics = []
+        for hour, energy in sorted(values):
+            # Hours at the bounds of the period belong to the neighbouring chunk
+            if dt_util.as_utc(begin) <= hour < dt_util.as_utc(finish):
+                total += energy
+                statistics.append({"start": hour, "sum": round(total, 3)})
+        state["sum"] = total
+
+        if statistics:
+            async_add_external_statistics(
+                self.hass,
+                {
+                    "has_mean": False,
+                    "mean_type": StatisticMeanType.NONE,
+                    "has_sum": True,
+                    "name": f"{charger.name} energy",
+                    "source": DOMAIN,
+                    "statistic_id": get_statistic_id(charger.id, "energy"),
+                    "unit_of_measurement": UnitOfEnergy.KILO_WATT_HOUR,
+                },
+                statistics,
+            )
+        return True
+
+    async def async_import_cost(self, cost_data, state, start, end):
+        """Import the cost of the chargers of a site for one chunk.
+
+        The breakdown only sums up the requested period, so a chunk adds one
+        point per charger, at the last hour of the chunk, holding the total
+        cost up to the end of the chunk. The imported cost history thus has
+        a resolution of a month, the last chunk ending today.
+        """
+        site = cost_data.site
+        begin = dt_util.start_of_local_day(start)
+        finish = dt_util.start_of_local_day(end)
+        await self.controller.api_budget.async_wait_for_reserve(
+            "GET", f"/api/sites/{site.id}/breakdown/", STATISTICS_COST_RESERVE
+        )
+        try:
+            costs = await site.get_cost_between_dates(
+                dt_util.as_utc(begin), dt_util.as_utc(finish)
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Failed to get cost history of site %s from %s: %s", site.id, start, err
+            )
+            return False
+        if costs is None:
+            return False
+
+        names = {charger.id: charger.name for charger in self.controller.get_chargers()}
+        sums = state.setdefault("sums", {})
+        hour = dt_util.as_utc(finish).replace(minute=0, second=0, microsecond=0)
+        hour -= timedelta(hours=1)
+        for cost in costs:
+            charger_id = cost.get("chargerId")
+            if charger_id not in names:
+                continue
+            sums[charger_id] = sums.get(charger_id, 0.0) + (cost.get("totalCost") or 0)
+            async_add_external_statistics(
+                self.hass,
+                {
+                    "has_mean": False,
+                    "mean_type": StatisticMeanType.NONE,
+                    "has_sum": True,
+                    "name": f"{names[charger_id]} cost",
+                    "source": DOMAIN,
+                    "statistic_id": get_statistic_id(charger_id, "cost"),
+                    "unit_of_measurement": cost.get("currencyId")
+                    or site.get("currencyId"),
+                },
+                [{"start": hour, "sum": round(sums[charger_id], 3)}],
+            )
+        return True
+
+    def get_statistics(self):
+        """Get import progress."""
+        progress = self.progress or {}
+        return {
+            "running": self.is_running(),
+            "start": progress.get("start"),
+            "chunks": self.chunks,
+            "next": {
+                key: state["next"] for key, state in progress.get("series", {}).items()
+            },
+        }
@@ -7,10 +7,9 @@ from pyeasee.exceptions import ForbiddenServiceException
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MANUFACTURER, MODEL_EQUALIZER
+from .const import DOMAIN
 from .entity import ChargerEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,7 +22,7 @@ async def async_setup_entry(
     controller = hass.data[DOMAIN]["controller"]
     entities = controller.get_switch_entities()
     async_add_entities(entities)
-    await controller.async_setup_done("switch")
+    await controller.async_setup_done("switch", async_add_entities)
 
 
 class ChargerSwitch(ChargerEntity, SwitchEntity):
@@ -70,15 +69,3 @@ class ChargerSwitch(ChargerEntity, SwitchEntity):
 
 class EqualizerSwitch(ChargerSwitch):
     """Easee equalizer switch class."""
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device information."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.data.product.id)},
-            serial_number=self.data.product.id,
-            name=self.data.product.name,
-            manufacturer=MANUFACTURER,
-            model=MODEL_EQUALIZER,
-            configuration_url=f"https://easee.cloud/mypage/products/{self.data.product.id}",
-        )
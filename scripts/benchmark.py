@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Benchmark the Controller hot paths against a fake Easee cloud.
+
+Every combination of --sites and --chargers (per site) is measured:
+
+    python scripts/benchmark.py --sites 1 10 --chargers 1 10 --save bench.json
+    python scripts/benchmark.py --sites 1 10 --chargers 1 10 --compare bench.json
+
+With --compare the run fails if a result is more than --tolerance worse than
+the baseline.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from fake_easee import (
+    async_close_controller,
+    async_create_controller,
+    make_account_products,
+)
+from pyeasee import ChargerStreamData
+
+# Observations sent by chargers while charging
+DISPATCH_OBSERVATIONS = [
+    ChargerStreamData.state_totalPower.value,
+    ChargerStreamData.state_sessionEnergy.value,
+    ChargerStreamData.state_energyPerHour.value,
+    ChargerStreamData.state_outputCurrent.value,
+    ChargerStreamData.state_inCurrentT3.value,
+    ChargerStreamData.state_inCurrentT4.value,
+    ChargerStreamData.state_inCurrentT5.value,
+    ChargerStreamData.state_inVoltageT1T2.value,
+]
+
+# Times each sensor recomputes its state and attributes
+ENTITY_UPDATE_ROUNDS = 20
+
+# Results where lower is better, with the unit reported
+METRICS = {
+    "initialize": "ms",
+    "create_entities": "ms",
+    "dispatch": "us/event",
+    "entity_update": "us/entity",
+    "poll_cycle": "ms",
+    "memory_per_charger": "KiB",
+}
+
+
+async def async_measure_memory(products):
+    """Measure memory held by a controller for products."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        hass, controller, _ = await async_create_controller(config_dir, products)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        await async_close_controller(hass, controller)
+    return after - before
+
+
+async def async_measure_memory_per_charger(sites, chargers):
+    """Measure memory per charger, without the fixed cost of hass and sites."""
+    fleet = await async_measure_memory(
+        make_account_products(sites=sites, chargers=chargers)
+    )
+    empty = await async_measure_memory(make_account_products(sites=sites, chargers=0))
+    return (fleet - empty) / (sites * chargers) / 1024
+
+
+async def async_benchmark(sites, chargers, events):
+    """Run all benchmarks for a fleet size."""
+    products = make_account_products(sites=sites, chargers=chargers)
+    timings = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass, controller, easee = await async_create_controller(
+            config_dir, products, timings=timings
+        )
+        await controller.async_subscribe_products()
+        product_ids = [charger.id for charger in controller.get_chargers()]
+
+        start = time.perf_counter()
+        for event in range(events):
+            await easee.push(
+                product_ids[event % len(product_ids)],
+                3,
+                DISPATCH_OBSERVATIONS[event % len(DISPATCH_OBSERVATIONS)],
+                float(event % 100),
+            )
+            if event % 100 == 99:
+                # Let coalesced entity updates be written
+                await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        dispatch = (time.perf_counter() - start) / events
+
+        # State and attributes of every sensor, without the attribute cache
+        sensors = controller.get_sensor_entities()
+        start = time.perf_counter()
+        for _ in range(ENTITY_UPDATE_ROUNDS):
+            for entity in sensors:
+                entity.invalidate_attributes()
+                entity.update_state()
+                _ = entity.extra_state_attributes
+        entity_update = (time.perf_counter() - start) / (
+            ENTITY_UPDATE_ROUNDS * len(sensors)
+        )
+
+        for product_data in controller.products_data.values():
+            product_data.last_poll = None
+        start = time.perf_counter()
+        await controller.async_refresh_sites_state()
+        poll_cycle = time.perf_counter() - start
+
+        await async_close_controller(hass, controller)
+
+    return {
+        "initialize": timings["initialize"] * 1e3,
+        "create_entities": timings["create_entities"] * 1e3,
+        "dispatch": dispatch * 1e6,
+        "entity_update": entity_update * 1e6,
+        "poll_cycle": poll_cycle * 1e3,
+        "memory_per_charger": await async_measure_memory_per_charger(sites, chargers),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Report results that are worse than the baseline, return True if none."""
+    passed = True
+    for name, result in results.items():
+        for metric, value in result.items():
+            reference = baseline.get(name, {}).get(metric)
+            if reference and value > reference * (1 + tolerance):
+                sys.stdout.write(
+                    f"REGRESSION {name} {metric}: {value:.2f} > {reference:.2f}"
+                    f" {METRICS[metric]}\n"
+                )
+                passed = False
+    return passed
+
+
+async def async_main(args):
+    """Run the benchmarks."""
+    results = {}
+    for sites in args.sites:
+        for chargers in args.chargers:
+            name = f"{sites}x{chargers}"
+            result = await async_benchmark(sites, chargers, args.events)
+            results[name] = result
+            sys.stdout.write(
+                f"{name:>8} "
+                + " ".join(
+                    f"{metric} {value:.2f} {METRICS[metric]}"
+                    for metric, value in result.items()
+                )
+                + "\n"
+            )
+    return results
+
+
+def main():
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, nargs="+", default=[1, 10])
+    parser.add_argument(
+        "--chargers", type=int, nargs="+", default=[1, 10], help="chargers per site"
+    )
+    parser.add_argument("--events", type=int, default=20000, help="events to dispatch")
+    parser.add_argument("--save", help="write results to this file")
+    parser.add_argument("--compare", help="compare with results saved earlier")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(async_main(args))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Run the real Controller and pyeasee against the mock Easee cloud.
+
+Reports end to end latency from a stream message being sent by the mock
+SignalR hub until the entity state is written, along with REST call and
+rate limiting counts:
+
+    python scripts/e2e_benchmark.py --sites 2 --chargers 10 --rate 200 --duration 60
+"""
+
+import argparse
+import asyncio
+import logging
+from statistics import quantiles
+import sys
+import tempfile
+import time
+
+from fake_easee import async_create_controller, make_account_products
+from mock_cloud import HUB_PATH, MockCloudServer, add_arguments
+from pyeasee import Easee
+
+TIMESTAMP_FIELD = "sessionEnergy"
+
+
+async def async_run(args):
+    """Run the controller against the mock cloud and report."""
+    server = MockCloudServer(
+        make_account_products(sites=args.sites, chargers=args.chargers),
+        latency=args.latency / 1000,
+        rate=args.rate,
+        rate_limit=args.rate_limit,
+    )
+    url = await server.async_start()
+
+    def easee_factory(username, password, session, user_agent, ssl):
+        # The mock cloud is plain http, so no ssl context
+        easee = Easee(username, password, session, user_agent)
+        easee.base = url
+        easee.sr_base = f"{url}{HUB_PATH}"
+        return easee
+
+    writes = 0
+    latencies = []
+    last_sent = {}
+
+    def on_write(entity):
+        nonlocal writes
+        writes += 1
+        if entity._state_key != f"state.{TIMESTAMP_FIELD}":
+            return
+        sent = entity.data.state[TIMESTAMP_FIELD]
+        if sent and sent != last_sent.get(entity):
+            last_sent[entity] = sent
+            latencies.append(time.time() - sent)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass, controller, _ = await async_create_controller(
+            config_dir, None, on_write=on_write, easee_factory=easee_factory
+        )
+        start = time.perf_counter()
+        await controller.async_run_startup_stages()
+        startup = time.perf_counter() - start
+
+        writes = 0
+        latencies.clear()
+        sent = server.sent
+        await asyncio.sleep(args.duration)
+        sent = server.sent - sent
+
+        await controller.async_cleanup()
+        await hass.async_stop(force=True)
+    await server.async_stop()
+
+    sys.stdout.write(
+        f"startup {startup:.2f}s, stages {controller.startup_statistics}\n"
+        f"stream: {sent} messages sent in {args.duration}s, {writes} state writes\n"
+        f"rest: {dict(server.cloud.requests)}, {server.rate_limited} rate limited\n"
+    )
+    if len(latencies) > 1:
+        cuts = quantiles(latencies, n=100, method="inclusive")
+        sys.stdout.write(
+            f"latency over {len(latencies)} messages: p50 {cuts[49] * 1e3:.2f}ms"
+            f" p95 {cuts[94] * 1e3:.2f}ms p99 {cuts[98] * 1e3:.2f}ms"
+            f" max {max(latencies) * 1e3:.2f}ms\n"
+        )
+    else:
+        sys.stdout.write("No timestamped messages were written\n")
+
+
+def main():
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(async_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
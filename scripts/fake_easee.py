@@ -0,0 +1,341 @@
+"""Stand-in for the Easee cloud used by the performance scripts.
+
+The real pyeasee Site, Circuit, Charger and Equalizer classes are used, only
+the REST client is replaced, so the integration's Controller can be run
+against a generated fleet without network access.
+"""
+
+import asyncio
+from collections import Counter
+from copy import deepcopy
+from functools import partial
+import json
+from pathlib import Path
+import re
+import sys
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+# Make custom_components importable when run from the scripts directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyeasee import ChargerStreamData, EqualizerStreamData, Site
+
+CHARGER_VALUES = {
+    ChargerStreamData.schedule_chargingSchedule.value: "",
+}
+EQUALIZER_VALUES = {
+    EqualizerStreamData.config_surplusCharging.value: json.dumps(
+        {"mode": 0, "standbycurrent": 0}
+    ),
+}
+
+
+def make_charger(charger_id, name, master_back_plate):
+    """Get the account products entry of a charger."""
+    return {
+        "id": charger_id,
+        "name": name,
+        "productCode": 1,
+        "levelOfAccess": 1,
+        "userRole": 1,
+        "backPlate": {"id": f"BP{charger_id}", "masterBackPlateId": master_back_plate},
+    }
+
+
+def make_site(site_no, charger_ids, equalizer_ids):
+    """Get the account products entry of a site with one circuit."""
+    site_id = 1000 + site_no
+    master_back_plate = f"BP{charger_ids[0]}" if charger_ids else None
+    return {
+        "id": site_id,
+        "name": f"Site {site_no}",
+        "siteKey": f"SK{site_id}",
+        "currencyId": "NOK",
+        "costPerKWh": 1.5,
+        "costPerKwhExcludeVat": 1.2,
+        "vat": 25.0,
+        "ratedCurrent": 63.0,
+        "circuits": [
+            {
+                "id": site_id * 10,
+                "panelName": "1",
+                "circuitPanelId": 1,
+                "ratedCurrent": 32.0,
+                "chargers": [
+                    make_charger(charger_id, f"Charger {charger_id}", master_back_plate)
+                    for charger_id in charger_ids
+                ],
+            }
+        ],
+        "equalizers": [
+            {"id": equalizer_id, "name": f"Equalizer {equalizer_id}"}
+            for equalizer_id in equalizer_ids
+        ],
+    }
+
+
+def make_account_products(sites=1, chargers=2, equalizers=0):
+    """Get account products for sites with the given number of products each."""
+    return [
+        make_site(
+            site_no,
+            [f"EH{site_no:03d}{no:03d}" for no in range(chargers)],
+            [f"QP{site_no:03d}{no:03d}" for no in range(equalizers)],
+        )
+        for site_no in range(sites)
+    ]
+
+
+def make_account_products_for(product_ids):
+    """Get account products for one site holding the given product ids."""
+    equalizer_ids = [
+        product_id for product_id in product_ids if product_id.startswith("QP")
+    ]
+    charger_ids = [
+        product_id for product_id in product_ids if product_id not in equalizer_ids
+    ]
+    return [make_site(0, charger_ids, equalizer_ids)]
+
+
+class FakeCloud:
+    """Answer Easee REST calls from generated data."""
+
+    def __init__(self, products):
+        """Initialize the fake cloud."""
+        self.products = products
+        self.requests = Counter()
+
+    def get_observations(self, product_id, ids):
+        """Get observations with neutral values."""
+        values = EQUALIZER_VALUES if product_id.startswith("QP") else CHARGER_VALUES
+        observations = []
+        for data_id in ids:
+            value = values.get(data_id, 0)
+            observations.append(
+                {
+                    "id": data_id,
+                    "value": value,
+                    "dataType": 6 if isinstance(value, str) else 4,
+                }
+            )
+        return {"observations": observations}
+
+    def respond(self, method, url):
+        """Get the response body of a request."""
+        parts = urlsplit(url)
+        path = parts.path
+
+        if match := re.fullmatch(r"/state/([^/]+)/observations", path):
+            self.requests["observations"] += 1
+            ids = parse_qs(parts.query).get("ids", [""])[0]
+            return self.get_observations(
+                match[1], [int(data_id) for data_id in ids.split(",") if data_id]
+            )
+        if path == "/api/accounts/login":
+            self.requests["login"] += 1
+            return {
+                "accessToken": "token",
+                "expiresIn": 86400,
+                "refreshToken": "refresh",
+            }
+        if path == "/api/accounts/products":
+            self.requests["products"] += 1
+            return deepcopy(self.products)
+        if match := re.fullmatch(r"/api/sites/(\d+)", path):
+            self.requests["site"] += 1
+            site = next(site for site in self.products if site["id"] == int(match[1]))
+            return {
+                key: value
+                for key, value in deepcopy(site).items()
+                if key not in ("circuits", "equalizers")
+            }
+        if re.fullmatch(r"/api/sites/\d+/breakdown/.*", path):
+            self.requests["cost"] += 1
+            return []
+        if re.fullmatch(r"/firmware/[^/]+/latest", path):
+            self.requests["firmware"] += 1
+            return {"latestFirmware": 300}
+        if re.fullmatch(r"/api/chargers/[^/]+/partners", path):
+            self.requests["operator"] += 1
+            return {"id": 0, "name": "Easee"}
+
+        self.requests[f"{method} other"] += 1
+        return {}
+
+
+class FakeResponse:
+    """Response with a JSON body."""
+
+    def __init__(self, data):
+        """Initialize the response."""
+        self.data = data
+
+    async def json(self):
+        """Get the body."""
+        return self.data
+
+
+class FakeEasee:
+    """Replacement for pyeasee.Easee answering from a FakeCloud.
+
+    Streaming is simulated: subscriptions are recorded and push() calls the
+    subscribed callback the way pyeasee does for received stream data.
+    """
+
+    def __init__(
+        self,
+        username=None,
+        password=None,
+        session=None,
+        user_agent=None,
+        ssl=None,
+        *,
+        cloud=None,
+        latency=0.0,
+    ):
+        """Initialize the client."""
+        self.cloud = cloud or FakeCloud(make_account_products())
+        self.latency = latency
+        self.sr_subscriptions = {}
+        self.sr_connected = False
+
+    async def _request(self, method, url):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return FakeResponse(self.cloud.respond(method, url))
+
+    async def get(self, url, **kwargs):
+        """Answer a GET request."""
+        return await self._request("GET", url)
+
+    async def post(self, url, **kwargs):
+        """Answer a POST request."""
+        return await self._request("POST", url)
+
+    async def put(self, url, **kwargs):
+        """Answer a PUT request."""
+        return await self._request("PUT", url)
+
+    async def delete(self, url, **kwargs):
+        """Answer a DELETE request."""
+        return await self._request("DELETE", url)
+
+    async def connect(self):
+        """Log in."""
+        await self._request("POST", "/api/accounts/login")
+
+    async def close(self):
+        """Close the client."""
+        self.sr_connected = False
+
+    async def get_account_products(self):
+        """Get all sites with their circuits, chargers and equalizers."""
+        records = await (await self.get("/api/accounts/products")).json()
+        sites = []
+        for record in records:
+            site = Site(
+                await (await self.get(f"/api/sites/{record['id']}")).json(), self
+            )
+            site["circuits"] = record["circuits"]
+            site["equalizers"] = record["equalizers"]
+            sites.append(site)
+        return sites
+
+    def sr_is_connected(self):
+        """Get the stream state."""
+        return self.sr_connected
+
+    async def sr_subscribe(self, product, callback):
+        """Subscribe to stream data of a product."""
+        self.sr_subscriptions[product.id] = callback
+        self.sr_connected = True
+
+    async def sr_unsubscribe(self, product):
+        """Unsubscribe from stream data of a product."""
+        self.sr_subscriptions.pop(product.id, None)
+
+    async def push(self, product_id, data_type, data_id, value):
+        """Deliver stream data to the subscriber of a product."""
+        callback = self.sr_subscriptions.get(product_id)
+        if callback is not None:
+            await callback(product_id, data_type, data_id, value)
+
+
+async def async_create_controller(
+    config_dir, products, latency=0.0, on_write=None, timings=None, easee_factory=None
+):
+    """Create and initialize a Controller for a fleet.
+
+    The controller talks to a FakeEasee for the products unless easee_factory
+    is given, which is then used in place of pyeasee.Easee. The entities are
+    attached to hass without going through the entity platforms. on_write,
+    if given, is called with the entity instead of writing state. The
+    duration of initialize and of entity creation is stored in timings.
+    """
+    # Imported here so the fake cloud can be used without Home Assistant
+    from custom_components.easee import controller as easee_controller
+    from custom_components.easee.const import DOMAIN
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    hass = HomeAssistant(config_dir)
+    hass.data[DOMAIN] = {}
+    # Entities disabled in the entity registry are not created
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    entry = SimpleNamespace(entry_id="fake", options={})
+
+    if easee_factory is None:
+        easee = FakeEasee(cloud=FakeCloud(products), latency=latency)
+        easee_controller.Easee = lambda *args, **kwargs: easee
+    else:
+        easee_controller.Easee = easee_factory
+    # The fake client needs no session, and a real one needs the network
+    # integration of a running Home Assistant
+    easee_controller.aiohttp_client = SimpleNamespace(
+        async_get_clientsession=lambda hass: None
+    )
+    controller = easee_controller.Controller("user", "password", hass, entry)
+    # As done by async_setup_entry, async_cleanup removes it again
+    hass.data[DOMAIN]["controller"] = controller
+    if timings is None:
+        timings = {}
+    create_entities = controller._create_entitites
+
+    def timed_create_entities():
+        start = time.perf_counter()
+        create_entities()
+        timings["create_entities"] = time.perf_counter() - start
+
+    controller._create_entitites = timed_create_entities
+    start = time.perf_counter()
+    await controller.async_initialize()
+    timings["initialize"] = time.perf_counter() - start
+
+    for entity in get_entities(controller):
+        entity.hass = hass
+        entity.async_write_ha_state = partial(on_write or (lambda entity: None), entity)
+    for product_data in controller.products_data.values():
+        await product_data.async_init_data()
+
+    return hass, controller, controller.easee
+
+
+def get_entities(controller):
+    """Get all entities created by a controller."""
+    return [
+        *controller.get_sensor_entities(),
+        *controller.get_switch_entities(),
+        *controller.get_binary_sensor_entities(),
+        *controller.get_button_entities(),
+        *controller.get_light_entities(),
+    ]
+
+
+async def async_close_controller(hass, controller):
+    """Stop the background work of a controller created by async_create_controller."""
+    controller.update_coalescer.async_cancel()
+    await controller.cost_scheduler.async_cleanup()
+    await hass.async_stop(force=True)
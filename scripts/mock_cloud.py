@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Local mock of the Easee cloud REST API and SignalR hub.
+
+REST calls are answered from a generated fleet by FakeCloud. Subscribed
+products get ProductUpdate messages on the SignalR hub at a configurable
+rate. Point pyeasee at it by setting Easee.base to the server URL and
+Easee.sr_base to <server URL>/hubs/chargers.
+
+    python scripts/mock_cloud.py --sites 2 --chargers 10 --rate 50 --rate-limit 100
+"""
+
+import argparse
+import asyncio
+from contextlib import suppress
+import json
+import logging
+import random
+import time
+import uuid
+
+from aiohttp import WSMsgType, web
+from fake_easee import FakeCloud, make_account_products
+from pyeasee import ChargerStreamData
+
+SIGNALR_SEPARATOR = "\x1e"
+SIGNALR_INVOCATION = 1
+SIGNALR_COMPLETION = 3
+SIGNALR_PING = 6
+HUB_PATH = "/hubs/chargers"
+
+# Observations pushed on the stream and their data types
+STREAM_OBSERVATIONS = [
+    (ChargerStreamData.state_totalPower.value, 3),
+    (ChargerStreamData.state_outputCurrent.value, 3),
+    (ChargerStreamData.state_inCurrentT3.value, 3),
+    (ChargerStreamData.state_inCurrentT4.value, 3),
+    (ChargerStreamData.state_inCurrentT5.value, 3),
+    (ChargerStreamData.state_inVoltageT1T2.value, 3),
+]
+
+# Observation carrying the send time, used to measure end to end latency
+TIMESTAMP_OBSERVATION = ChargerStreamData.state_sessionEnergy.value
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MockCloudServer:
+    """Mock Easee REST API and SignalR hub."""
+
+    def __init__(self, products, latency=0.0, rate=10.0, rate_limit=None):
+        """Initialize the server.
+
+        latency is added to every REST call, rate is the number of stream
+        messages per second for all products and rate_limit the number of
+        REST calls allowed per minute before answering 429.
+        """
+        self.cloud = FakeCloud(products)
+        self.latency = latency
+        self.rate = rate
+        self.rate_limit = rate_limit
+        self.calls = []
+        self.rate_limited = 0
+        self.subscriptions = {}
+        self.sent = 0
+        self.app = web.Application()
+        self.app.router.add_post(f"{HUB_PATH}/negotiate", self.negotiate)
+        self.app.router.add_get(HUB_PATH, self.hub)
+        self.app.router.add_route("*", "/{path:.*}", self.rest)
+        self.runner = None
+        self.url = None
+
+    async def async_start(self, host="127.0.0.1", port=0):
+        """Start serving, port 0 picks a free port."""
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        _LOGGER.info("Mock Easee cloud listening on %s", self.url)
+        return self.url
+
+    async def async_stop(self):
+        """Stop serving."""
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def is_rate_limited(self):
+        """Check the call budget of the last minute."""
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        self.calls = [call for call in self.calls if now - call < 60]
+        if len(self.calls) >= self.rate_limit:
+            return True
+        self.calls.append(now)
+        return False
+
+    async def rest(self, request):
+        """Answer a REST call."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.is_rate_limited():
+            self.rate_limited += 1
+            retry_after = int(60 - (time.monotonic() - self.calls[0])) + 1
+            return web.json_response(
+                {"title": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+        return web.json_response(
+            self.cloud.respond(request.method, str(request.rel_url))
+        )
+
+    async def negotiate(self, request):
+        """Answer the SignalR negotiation."""
+        return web.json_response(
+            {
+                "connectionId": str(uuid.uuid4()),
+                "negotiateVersion": 0,
+                "availableTransports": [
+                    {"transport": "WebSockets", "transferFormats": ["Text"]}
+                ],
+            }
+        )
+
+    async def hub(self, request):
+        """Run a SignalR connection."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sender = None
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    break
+                for raw in msg.data.split(SIGNALR_SEPARATOR):
+                    if not raw:
+                        continue
+                    message = json.loads(raw)
+                    if "protocol" in message:
+                        # Handshake
+                        await ws.send_str("{}" + SIGNALR_SEPARATOR)
+                        sender = asyncio.create_task(self.async_send_updates(ws))
+                    elif message.get("type") == SIGNALR_INVOCATION:
+                        await self.async_invoke(ws, message)
+        finally:
+            if sender is not None:
+                sender.cancel()
+                with suppress(asyncio.CancelledError):
+                    await sender
+        return ws
+
+    async def async_invoke(self, ws, message):
+        """Handle a hub method called by the client."""
+        if message.get("target") == "SubscribeWithCurrentState":
+            product_id = message["arguments"][0]
+            self.subscriptions.setdefault(ws, set()).add(product_id)
+        if "invocationId" in message:
+            await ws.send_str(
+                json.dumps(
+                    {
+                        "type": SIGNALR_COMPLETION,
+                        "invocationId": message["invocationId"],
+                        "result": None,
+                    }
+                )
+                + SIGNALR_SEPARATOR
+            )
+
+    async def async_send_updates(self, ws):
+        """Send ProductUpdate messages for subscribed products."""
+        interval = 1 / self.rate
+        next_send = time.monotonic()
+        while not ws.closed:
+            next_send += interval
+            await asyncio.sleep(max(0, next_send - time.monotonic()))
+            products = self.subscriptions.get(ws)
+            if not products:
+                continue
+            product_id = random.choice(sorted(products))
+            if self.sent % 2:
+                data_id, data_type = random.choice(STREAM_OBSERVATIONS)
+                value = str(round(random.uniform(0, 32), 1))
+            else:
+                data_id, data_type, value = TIMESTAMP_OBSERVATION, 3, repr(time.time())
+            update = {
+                "mid": product_id,
+                "dataType": data_type,
+                "id": data_id,
+                "value": value,
+            }
+            await ws.send_str(
+                json.dumps(
+                    {
+                        "type": SIGNALR_INVOCATION,
+                        "target": "ProductUpdate",
+                        "arguments": [update],
+                    }
+                )
+                + SIGNALR_SEPARATOR
+            )
+            self.sent += 1
+
+
+async def async_main(args):
+    """Run the server until interrupted."""
+    server = MockCloudServer(
+        make_account_products(sites=args.sites, chargers=args.chargers),
+        latency=args.latency / 1000,
+        rate=args.rate,
+        rate_limit=args.rate_limit,
+    )
+    await server.async_start(port=args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.async_stop()
+
+
+def add_arguments(parser):
+    """Add the fleet and server arguments."""
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--chargers", type=int, default=2, help="chargers per site")
+    parser.add_argument("--latency", type=float, default=0, help="REST latency in ms")
+    parser.add_argument(
+        "--rate", type=float, default=10, help="stream messages per second"
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, help="REST calls per minute before answering 429"
+    )
+
+
+def main():
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--port", type=int, default=8080)
+    logging.basicConfig(level=logging.INFO)
+    with suppress(KeyboardInterrupt):
+        asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
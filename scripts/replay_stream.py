@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Replay a stream capture into a Controller and report dispatch performance.
+
+A capture is recorded with the easee.stream_capture service. Each speed runs
+on a fresh Controller with a fake fleet holding the captured products:
+
+    python scripts/replay_stream.py config/easee_stream_capture.jsonl --speed 1 10 100
+"""
+
+import argparse
+import asyncio
+import logging
+from statistics import quantiles
+import sys
+import tempfile
+import time
+
+from fake_easee import (
+    async_close_controller,
+    async_create_controller,
+    make_account_products_for,
+)
+
+from custom_components.easee.controller import StreamCapture
+
+
+async def async_replay(events, speed):
+    """Replay events at a speed and return the results."""
+    product_ids = sorted({event[1] for event in events})
+    waiting = []
+    latencies = []
+    writes = 0
+
+    def on_write(entity):
+        nonlocal writes
+        writes += 1
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass, controller, easee = await async_create_controller(
+            config_dir, make_account_products_for(product_ids), on_write=on_write
+        )
+        await controller.async_subscribe_products()
+
+        # An event is done when the entity updates it caused are written
+        coalescer = controller.update_coalescer
+        flush = coalescer.async_flush
+
+        def timed_flush():
+            flush()
+            now = time.perf_counter()
+            latencies.extend(now - start for start in waiting)
+            waiting.clear()
+
+        coalescer.async_flush = timed_flush
+
+        loop_start = time.perf_counter()
+        for offset, product_id, data_type, data_id, value in events:
+            delay = loop_start + offset / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = time.perf_counter()
+            await easee.push(product_id, data_type, data_id, value)
+            if coalescer.pending:
+                waiting.append(start)
+            else:
+                latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+        duration = time.perf_counter() - loop_start
+
+        await async_close_controller(hass, controller)
+
+    return {
+        "speed": speed,
+        "events": len(events),
+        "products": len(product_ids),
+        "duration": duration,
+        "writes": writes,
+        "latencies": latencies,
+    }
+
+
+def report(result):
+    """Print the results of a replay."""
+    latencies = sorted(result["latencies"])
+    if len(latencies) > 1:
+        cuts = quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    sys.stdout.write(
+        f"{result['speed']:>6g}x  {result['events']} events for {result['products']} products"
+        f" in {result['duration']:.2f}s ({result['events'] / result['duration']:.0f} events/s),"
+        f" {result['writes']} state writes, latency"
+        f" p50 {p50 * 1e3:.3f}ms p95 {p95 * 1e3:.3f}ms p99 {p99 * 1e3:.3f}ms\n"
+    )
+
+
+async def async_main(args):
+    """Run the replays."""
+    events = StreamCapture.load(args.capture)
+    if not events:
+        sys.stdout.write("No events in capture\n")
+        return
+    for speed in args.speed:
+        report(await async_replay(events, speed))
+
+
+def main():
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="file saved by the stream_capture service")
+    parser.add_argument(
+        "--speed", type=float, nargs="+", default=[1, 10, 100], help="replay speeds"
+    )
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()